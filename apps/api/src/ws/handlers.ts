@@ -75,21 +75,50 @@ export function setupSocketHandlers(io: SocketIOServer): void {
       socket.join('health');
     });
 
-    // Worker event processing — create Event from event_candidate
+    // Worker event processing — create Event from event_candidate.
+    // Track-aware candidates reuse their id: phase 'start' (or none) creates the
+    // Event, 'update' and 'end' amend it (metadata, summary, timestampEnd).
     socket.on('worker:event_candidate', async (data: any) => {
       if (!(socket as any).isWorker) return; // only workers can emit events
 
+      if (data.phase === 'update' || data.phase === 'end') {
+        try {
+          const { count } = await prisma.event.updateMany({
+            where: { id: data.id, cameraId: data.cameraId },
+            data: {
+              summary: data.summary || undefined,
+              metadata: data.metadata || undefined,
+              timestampEnd: data.timestampEnd ? new Date(data.timestampEnd) : undefined,
+            },
+          });
+          if (count > 0) {
+            io.to(`camera:${data.cameraId}`).emit('event:update', {
+              id: data.id,
+              phase: data.phase,
+              summary: data.summary,
+              timestampEnd: data.timestampEnd ?? null,
+              objectClass: (data.metadata as any)?.className || null,
+              confidence: (data.metadata as any)?.bestConfidence ?? (data.metadata as any)?.confidence ?? null,
+            });
+          }
+        } catch (err) {
+          logger.error({ err, data }, 'Failed to update event from worker candidate');
+        }
+        return;
+      }
+
       try {
         const [event, camera] = await Promise.all([
           prisma.event.create({
             data: {
+              ...(data.phase === 'start' && data.id ? { id: data.id } : {}),
               type: data.type || 'object_detected',
               severity: (data.severity || 'info').toUpperCase() as any,
               summary: data.summary || 'Detection event',
               cameraId: data.cameraId,
               metadata: data.metadata || null,
               snapshotUrl: data.snapshotPath || null,
-              timestampStart: new Date(data.timestamp || Date.now()),
+              timestampStart: new Date(data.timestampStart || data.timestamp || Date.now()),
             },
           }),
           prisma.camera.findUnique({
@@ -133,13 +162,31 @@ export function setupSocketHandlers(io: SocketIOServer): void {
     });
 
     // Worker tracks — forward active bounding boxes + track ids to subscribers
-    socket.on('worker:tracks', (data: any) => {
+    const forwardTracks = (data: any) => {
       if (!(socket as any).isWorker) return;
       if (!data?.cameraId) return;
       io.to(`camera:${data.cameraId}`).emit('camera:tracks', {
         cameraId: data.cameraId,
         tracks: Array.isArray(data.tracks) ? data.tracks : [],
-        capturedAt: data.capturedAt ?? new Date().toISOString(),
+        capturedAt: data.capturedAt ?? data.timestamp ?? new Date().toISOString(),
+      });
+    };
+    socket.on('worker:tracks', forwardTracks);
+    // Per-frame live boxes from the CV worker (possibly inside worker:batch)
+    socket.on('worker:track_update', forwardTracks);
+
+    // Worker motion — forward motion statistics (foreground ratio, blobs) to subscribers
+    socket.on('worker:motion', (data: any) => {
+      if (!(socket as any).isWorker) return;
+      if (!data?.cameraId) return;
+      io.to(`camera:${data.cameraId}`).emit('camera:motion', {
+        cameraId: data.cameraId,
+        frameNumber: data.frameNumber ?? null,
+        foregroundRatio: data.foregroundRatio ?? 0,
+        largestArea: data.largestArea ?? 0,
+        blobCount: data.blobCount ?? 0,
+        boxes: Array.isArray(data.boxes) ? data.boxes : [],
+        capturedAt: data.timestamp ?? new Date().toISOString(),
       });
     });
 
@@ -164,6 +211,20 @@ export function setupSocketHandlers(io: SocketIOServer): void {
       }
     });
 
+    // Worker batch — coalesced worker:* events, replayed in order through the handlers above
+    socket.on('worker:batch', async (data: any) => {
+      if (!(socket as any).isWorker) return;
+      const items = Array.isArray(data?.items) ? data.items : [];
+      for (const item of items) {
+        if (typeof item?.event !== 'string' || !item.event.startsWith('worker:') || item.event === 'worker:batch') {
+          continue;
+        }
+        for (const listener of socket.listeners(item.event)) {
+          await (listener as (payload: any) => unknown)(item.data);
+        }
+      }
+    });
+
     socket.on('disconnect', () => {
       const demo = getDemoSimulator();
       if (demo) demo.disconnectSocket(socket.id);
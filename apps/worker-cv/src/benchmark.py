@@ -0,0 +1,146 @@
+"""Compare inference backends against the PyTorch (.pt) baseline.
+
+Usage:
+    python -m src.benchmark --source /path/to/clip.mp4 --frames 200 --backends onnx openvino
+    python -m src.benchmark --source rtsp://camera/stream --backends onnx --int8
+
+Latency is measured per single-frame predict after warm-up. Accuracy is
+reported as agreement with the baseline's detections on the same frames
+(same class, IoU >= 0.5): precision, recall and F1, so no labelled dataset
+is needed.
+"""
+
+import argparse
+import json
+import logging
+import time
+
+import cv2
+import numpy as np
+
+from .config import Settings
+from .inference.detector import Detector, result_to_array
+from .inference.export import BACKENDS
+
+logger = logging.getLogger("motionops.benchmark")
+
+WARMUP_FRAMES = 3
+MATCH_IOU = 0.5
+
+
+def read_frames(source: str, count: int) -> list[np.ndarray]:
+    cap = cv2.VideoCapture(int(source) if source.isdigit() else source)
+    frames = []
+    while len(frames) < count:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def run_backend(detector: Detector, frames: list[np.ndarray],
+                settings) -> tuple[list[np.ndarray], np.ndarray]:
+    """Return per-frame detections (N, 6) and per-frame latencies in ms."""
+    for frame in frames[:WARMUP_FRAMES]:
+        detector.predict([frame], settings)
+    detections, latencies = [], []
+    for frame in frames:
+        start = time.perf_counter()
+        results = detector.predict([frame], settings)
+        latencies.append((time.perf_counter() - start) * 1000)
+        detections.append(result_to_array(results[0] if results else None))
+    return detections, np.asarray(latencies)
+
+
+def _iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU between (N, 4) and (M, 4) xyxy boxes."""
+    tl = np.maximum(a[:, None, :2], b[None, :, :2])
+    br = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.clip(br - tl, 0, None).prod(axis=2)
+    area_a = (a[:, 2:] - a[:, :2]).prod(axis=1)
+    area_b = (b[:, 2:] - b[:, :2]).prod(axis=1)
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+def agreement(baseline: list[np.ndarray], candidate: list[np.ndarray]) -> dict:
+    """Greedy same-class IoU matching of candidate detections against the baseline.
+
+    Pairs are taken in descending IoU across the whole frame, so a box whose
+    best partner is already taken still matches its next-best one.
+    """
+    matched = total_base = total_cand = 0
+    for base, cand in zip(baseline, candidate):
+        total_base += len(base)
+        total_cand += len(cand)
+        if not len(base) or not len(cand):
+            continue
+        iou = _iou(cand[:, :4], base[:, :4])
+        iou[cand[:, 5][:, None] != base[:, 5][None, :]] = 0
+        used_cand, used_base = set(), set()
+        for i, j in zip(*np.unravel_index(np.argsort(-iou, axis=None), iou.shape)):
+            if iou[i, j] < MATCH_IOU:
+                break
+            if i not in used_cand and j not in used_base:
+                used_cand.add(i)
+                used_base.add(j)
+                matched += 1
+    precision = matched / total_cand if total_cand else 1.0
+    recall = matched / total_base if total_base else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": round(precision, 4), "recall": round(recall, 4), "f1": round(f1, 4)}
+
+
+def benchmark(settings: Settings, source: str, frame_count: int, backends: list[str],
+              int8: bool) -> list[dict]:
+    frames = read_frames(source, frame_count)
+    if not frames:
+        raise SystemExit(f"No frames could be read from {source}")
+
+    report = []
+    baseline = None
+    for backend in ["torch", *[b for b in backends if b != "torch"]]:
+        detector = Detector(settings.model_path, backend=backend, int8=int8 and backend != "torch",
+                            imgsz=settings.inference_size, cache_dir=settings.model_cache_dir)
+        if not detector.load() or detector.backend != backend:
+            logger.error("Skipping backend %s: model could not be loaded", backend)
+            continue
+        detections, latencies = run_backend(detector, frames, settings)
+        entry = {
+            "backend": backend,
+            "int8": detector.int8 if backend != "torch" else False,
+            "frames": len(frames),
+            "latencyMeanMs": round(float(latencies.mean()), 2),
+            "latencyP50Ms": round(float(np.percentile(latencies, 50)), 2),
+            "latencyP95Ms": round(float(np.percentile(latencies, 95)), 2),
+            "detections": int(sum(len(d) for d in detections)),
+        }
+        if baseline is None:
+            baseline = (detections, entry["latencyMeanMs"])
+        else:
+            entry["speedup"] = round(baseline[1] / entry["latencyMeanMs"], 2)
+            entry.update(agreement(baseline[0], detections))
+        report.append(entry)
+    return report
+
+
+def main() -> None:
+    settings = Settings()
+    parser = argparse.ArgumentParser(
+        description="Benchmark inference backends against the .pt baseline")
+    parser.add_argument("--source", default=settings.camera_source,
+                        help="video file, RTSP URL or webcam index")
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--backends", nargs="+", default=["onnx", "openvino"], choices=BACKENDS)
+    parser.add_argument("--int8", action="store_true", help="quantize exported models to INT8")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    report = benchmark(settings, args.source, args.frames, args.backends, args.int8)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,28 @@ import re
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
+from .inference.export import BACKENDS
+from .motion import MotionZone, available_backends
+from .stages import BACKPRESSURE_POLICIES, QUEUED_STAGES
+
+
+def _check_camera_source(v: str) -> str:
+    """Validate camera source is a known safe format."""
+    # Allow integer (webcam index)
+    try:
+        int(v)
+        return v
+    except ValueError:
+        pass
+    # Allow known protocols
+    allowed_prefixes = ('rtsp://', 'http://', 'https://', 'rtmp://')
+    if v.startswith(allowed_prefixes):
+        return v
+    # Allow local file paths (but not traversal)
+    if '..' in v:
+        raise ValueError("Directory traversal not allowed in camera_source")
+    return v
+
 
 class Settings(BaseSettings):
     """Worker-CV configuration loaded from environment."""
@@ -17,24 +39,90 @@ class Settings(BaseSettings):
     camera_source: str = "0"  # webcam index, RTSP URL, or file path
     camera_protocol: str = "auto"  # auto, rtsp, mjpeg, hls, rtmp, webcam, file, webrtc
     camera_fps: int = 25
+    analysis_fps: float = 0  # frames/sec decoded and analyzed; 0 = every frame
+    camera_sources: list[str] = []  # extra sources started at boot alongside camera_source
+    max_cameras: int = 16
+    # direct, latest, lossless, auto (latest for live, lossless for files)
+    capture_mode: str = "auto"
+    capture_buffer_size: int = 4
+
+    # Pipeline stages (capture -> motion -> detection -> emit)
+    stage_queue_size: int = 2  # frames waiting in front of each stage
+    # Policy per stage when its queue is full: drop_oldest, drop_newest or block. Unset stages
+    # block on lossless sources (files) and drop the oldest frame otherwise; emit always blocks
+    stage_backpressure: dict[str, str] = {}
 
     # Detection
     model_path: str = "yolov8n.pt"
+    # torch, onnx (needs onnx + onnxruntime), openvino (needs openvino)
+    inference_backend: str = "torch"
+    inference_int8: bool = False  # INT8 quantization for onnx/openvino exports
+    model_cache_dir: str = "models"  # where exported models are cached
+    warmup_runs: int = 2  # blank-frame inferences at inference_size before serving
     detector_confidence: float = 0.5
     detector_iou: float = 0.45
     detector_classes: list[str] = ["person", "car", "truck", "bicycle"]
+    detector_class_confidence: dict[str, float] = {}  # per-class overrides of detector_confidence
     inference_size: int = 640
+    # worker:detection payload: objects (one dict per box) or columnar
+    detection_format: str = "objects"
+    inference_batch_size: int = 8  # max frames per batched predict across cameras
+    inference_batch_deadline_ms: float = 40  # max time a frame waits for its batch to fill
+    # Inference processes: 0 = in-process, -1 = scale with cores (needs shm_size for the frame ring)
+    inference_workers: int = 0
+    inference_threads: int = 2  # intra-op threads per inference process
+    inference_slots: int = 0  # shm frame slots; 0 = 2 x workers x batch, capped to /dev/shm
+    inference_slot_bytes: int = 1920 * 1080 * 3  # larger frames are pickled instead
+    roi_inference: bool = False  # run YOLO on padded crops around motion instead of the full frame
+    roi_padding: float = 0.2  # margin around each motion box, as a fraction of its size
+    roi_min_size: int = 160  # minimum crop side in pixels
+    roi_max_regions: int = 4
 
     # Motion
+    motion_backend: str = "mog2"  # framediff, running_avg, mog2, knn, block
     motion_sensitivity: float = 0.5
-    motion_min_area: int = 500
+    motion_min_area: int = 500  # in full-resolution pixels, rescaled to the motion frame
+    motion_resolution: int = 320  # width of the motion-analysis frame; 0 = full resolution
+    motion_grayscale: bool = True
+    motion_zones: list[MotionZone] = []  # include/exclude polygons, normalized coordinates
+    motion_telemetry_interval_seconds: float = 1.0  # worker:motion rate while motion persists
+
+    # Motion gate (when YOLO runs)
+    gate_activation_frames: int = 1  # consecutive motion frames before detection starts
+    gate_release_frames: int = 5  # consecutive still frames before detection stops
+    gate_min_active_seconds: float = 1.0
+    gate_infer_every_n: int = 1  # while active, run YOLO on every Nth frame
+    gate_max_inferences_per_second: float = 0  # per camera; 0 = unlimited
 
     # Tracking
     tracking_buffer: int = 30
     tracking_match_threshold: float = 0.8
 
+    # Event candidates (one event per track: start, significant updates, end)
+    event_track_ttl_seconds: float = 2.0  # a track unseen this long is closed
+    event_max_tracks: int = 256  # open tracks per camera; the least recently seen is closed first
+    event_confidence_step: float = 0.1  # confidence gain since the last report that sends an update
+
+    # Outbound events
+    emit_batch_interval_ms: float = 100  # batch detections, tracks, event candidates; 0 = send each
+    emit_batch_max_items: int = 100  # flush early once this many events are buffered
+    outbound_queue_size: int = 1000  # events waiting for the sender before overflow
+    spool_path: str = "spool/outbound.jsonl"  # overflow of events that must not be lost
+    spool_max_bytes: int = 50 * 1024 * 1024
+
     # Health
     health_interval_seconds: int = 10
+    # Embedded HTTP server (/metrics, /healthz, /debug/pipeline). Loopback by
+    # default on a bare host; the Docker image sets 0.0.0.0 so it can be scraped
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = 9100  # 0 disables the server
+
+    # Profiling (worker:profile, or POST /debug/profile when enabled)
+    profile_dir: str = "profiles"  # Chrome trace JSON and cProfile dumps
+    profile_max_seconds: float = 60  # longer requests are capped
+    profile_max_spans: int = 500_000  # spans kept per session; bounds memory
+    # Serve POST /debug/profile on the metrics server; requires api_key in X-Worker-Key
+    profile_http_enabled: bool = False
 
     @field_validator('model_path')
     @classmethod
@@ -47,25 +135,133 @@ class Settings(BaseSettings):
             )
         return v
 
+    @field_validator('capture_mode')
+    @classmethod
+    def validate_capture_mode(cls, v: str) -> str:
+        """Only allow the capture modes OpenCVSource implements."""
+        if v not in ("direct", "latest", "lossless", "auto"):
+            raise ValueError(
+                f"Invalid capture_mode '{v}'. Must be direct, latest, lossless or auto")
+        return v
+
+    @field_validator('inference_backend')
+    @classmethod
+    def validate_inference_backend(cls, v: str) -> str:
+        """Only allow runtimes the detector knows how to export to."""
+        if v not in BACKENDS:
+            raise ValueError(
+                f"Invalid inference_backend '{v}'. Must be one of: {', '.join(BACKENDS)}")
+        return v
+
+    @field_validator('detection_format')
+    @classmethod
+    def validate_detection_format(cls, v: str) -> str:
+        """Only allow payload formats DetectionBatch can produce."""
+        if v not in ("objects", "columnar"):
+            raise ValueError(f"Invalid detection_format '{v}'. Must be objects or columnar")
+        return v
+
+    @field_validator('stage_backpressure')
+    @classmethod
+    def validate_stage_backpressure(cls, v: dict[str, str]) -> dict[str, str]:
+        """Only allow queued stages and known policies; unset stages use stages.default_policy."""
+        for stage, policy in v.items():
+            if stage not in QUEUED_STAGES:
+                raise ValueError(
+                    f"Invalid stage '{stage}'. Must be one of: {', '.join(QUEUED_STAGES)}")
+            if policy not in BACKPRESSURE_POLICIES:
+                raise ValueError(f"Invalid backpressure policy '{policy}'. "
+                                 f"Must be one of: {', '.join(BACKPRESSURE_POLICIES)}")
+        return v
+
+    @field_validator('metrics_port')
+    @classmethod
+    def validate_metrics_port(cls, v: int) -> int:
+        """Only allow a TCP port, or 0 to disable the metrics server."""
+        if not 0 <= v <= 65535:
+            raise ValueError(f"Invalid metrics_port {v}. Must be 0-65535")
+        return v
+
+    @field_validator('profile_max_seconds')
+    @classmethod
+    def validate_profile_max_seconds(cls, v: float) -> float:
+        """Only allow a positive profiling cap."""
+        if v <= 0:
+            raise ValueError(f"Invalid profile_max_seconds {v}. Must be positive")
+        return v
+
+    @field_validator('motion_backend')
+    @classmethod
+    def validate_motion_backend(cls, v: str) -> str:
+        """Only allow registered motion-detector backends."""
+        if v not in available_backends():
+            raise ValueError(f"Invalid motion_backend '{v}'. "
+                             f"Must be one of: {', '.join(available_backends())}")
+        return v
+
     @field_validator('camera_source')
     @classmethod
     def validate_camera_source(cls, v: str) -> str:
         """Validate camera source is a known safe format."""
-        # Allow integer (webcam index)
-        try:
-            int(v)
-            return v
-        except ValueError:
-            pass
-        # Allow known protocols
-        allowed_prefixes = ('rtsp://', 'http://', 'https://', 'rtmp://')
-        if v.startswith(allowed_prefixes):
-            return v
-        # Allow local file paths (but not traversal)
-        if '..' in v:
-            raise ValueError("Directory traversal not allowed in camera_source")
-        return v
+        return _check_camera_source(v)
+
+    @field_validator('camera_sources')
+    @classmethod
+    def validate_camera_sources(cls, v: list[str]) -> list[str]:
+        """Apply the camera_source rules to every extra source."""
+        return [_check_camera_source(source) for source in v]
 
     class Config:
         env_prefix = "WORKER_"
         env_file = ".env"
+
+
+# Runtime config (section, field) as sent by `config:update` -> Settings attribute
+RUNTIME_FIELDS: dict[tuple[str, str], str] = {
+    ("detector", "confidence"): "detector_confidence",
+    ("detector", "iou"): "detector_iou",
+    ("detector", "classes"): "detector_classes",
+    ("detector", "classConfidence"): "detector_class_confidence",
+    ("detector", "inferenceSize"): "inference_size",
+    ("detector", "roiInference"): "roi_inference",
+    ("pipeline", "analysisFps"): "analysis_fps",
+    ("motion", "backend"): "motion_backend",
+    ("motion", "sensitivity"): "motion_sensitivity",
+    ("motion", "minArea"): "motion_min_area",
+    ("motion", "resolution"): "motion_resolution",
+    ("motion", "grayscale"): "motion_grayscale",
+    ("motion", "zones"): "motion_zones",
+    ("motion", "activationFrames"): "gate_activation_frames",
+    ("motion", "releaseFrames"): "gate_release_frames",
+    ("motion", "minActiveSeconds"): "gate_min_active_seconds",
+    ("motion", "inferEveryN"): "gate_infer_every_n",
+    ("motion", "maxInferencesPerSecond"): "gate_max_inferences_per_second",
+    ("tracking", "trackBuffer"): "tracking_buffer",
+    ("tracking", "matchThreshold"): "tracking_match_threshold",
+}
+
+
+def resolve_runtime_field(section: str | None, field: str | None) -> str | None:
+    """Map a runtime config (section, field) pair to a Settings attribute name."""
+    return RUNTIME_FIELDS.get((section, field))
+
+
+def camera_settings(base: Settings, source: str, overrides: dict | None = None) -> Settings:
+    """Derive a validated per-camera Settings copy from the worker defaults.
+
+    Unknown override keys are ignored so backend payloads can carry extra data.
+    """
+    data = base.model_dump()
+    for key, value in (overrides or {}).items():
+        if key in Settings.model_fields:
+            data[key] = value
+    data["camera_source"] = source
+    return Settings(**data)
+
+
+def update_setting(settings: Settings, attr: str, value):
+    """Validate and set a single Settings attribute. Returns the previous value, JSON-ready."""
+    previous = settings.model_dump(mode="json", include={attr})[attr]
+    validated = Settings(**{**settings.model_dump(), attr: value})
+    setattr(settings, attr, getattr(validated, attr))
+    return previous
@@ -0,0 +1,121 @@
+"""Embedded HTTP server: /metrics, /healthz, /debug/pipeline and the opt-in /debug/profile."""
+
+import asyncio
+import contextlib
+import logging
+import secrets
+
+import uvicorn
+from fastapi import FastAPI, Header, Response
+from fastapi.responses import JSONResponse
+
+from .metrics import render_prometheus
+
+logger = logging.getLogger("motionops.http")
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+SHUTDOWN_TIMEOUT_SECONDS = 5
+
+
+def create_app(supervisor) -> FastAPI:
+    """Routes over a running Supervisor.
+
+    The read-only handlers are plain functions, so FastAPI runs them on its
+    thread pool: a scrape copies histograms and computes percentiles without
+    taking the event loop away from the camera stages.
+
+    /debug/profile starts tracing and writes files, so it is only served
+    when `profile_http_enabled` is set and an `api_key` is configured, and
+    each request must carry that key in X-Worker-Key.
+    """
+    app = FastAPI(title="MotionOps Worker-CV", docs_url=None, redoc_url=None, openapi_url=None)
+
+    @app.get("/metrics")
+    def metrics() -> Response:
+        return Response(render_prometheus(supervisor.metrics_snapshot()),
+                        media_type=PROMETHEUS_CONTENT_TYPE)
+
+    @app.get("/healthz")
+    def healthz() -> JSONResponse:
+        healthy = supervisor.running
+        return JSONResponse(
+            {
+                "status": "ok" if healthy else "stopping",
+                "modelLoaded": supervisor.detector.loaded,
+                "activeCameras": supervisor.active_cameras,
+                "uptime": round(supervisor.process_metrics.uptime_seconds),
+            },
+            status_code=200 if healthy else 503,
+        )
+
+    @app.get("/debug/pipeline")
+    def debug_pipeline() -> dict:
+        return supervisor.debug_snapshot()
+
+    settings = supervisor.settings
+    if settings.profile_http_enabled and not settings.api_key:
+        logger.warning(
+            "profile_http_enabled is set but api_key is empty; not serving /debug/profile")
+    elif settings.profile_http_enabled:
+        @app.post("/debug/profile")
+        async def debug_profile(seconds: float = 10, cprofile: bool = False,
+                                x_worker_key: str = Header(default="")) -> JSONResponse:
+            if not secrets.compare_digest(x_worker_key.encode(), settings.api_key.encode()):
+                return JSONResponse({"error": "Invalid worker key"}, status_code=403)
+            # Awaits the profile on the event loop; the request just stays open meanwhile
+            if supervisor.profiler.running:
+                return JSONResponse({"error": "A profile is already running"}, status_code=409)
+            return JSONResponse(await supervisor.profile(seconds, cprofile=cprofile))
+
+    return app
+
+
+class _EmbeddedServer(uvicorn.Server):
+    """uvicorn server that leaves SIGINT/SIGTERM to the worker."""
+
+    def install_signal_handlers(self) -> None:
+        pass
+
+    @contextlib.contextmanager
+    def capture_signals(self):
+        yield
+
+
+class MetricsServer:
+    """Serves create_app(supervisor) on the worker's event loop.
+
+    Usage:
+        server = MetricsServer(supervisor, "127.0.0.1", 9100)
+        await server.start()
+        ...
+        await server.stop()
+    """
+
+    def __init__(self, supervisor, host: str = "127.0.0.1", port: int = 9100):
+        config = uvicorn.Config(
+            create_app(supervisor), host=host, port=port,
+            log_config=None, access_log=False, lifespan="off",
+        )
+        self._server = _EmbeddedServer(config)
+        self._task: asyncio.Task | None = None
+        self.host = host
+        self.port = port
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._serve(), name="metrics-server")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._server.should_exit = True
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(self._task, SHUTDOWN_TIMEOUT_SECONDS)
+        self._task = None
+
+    async def _serve(self) -> None:
+        logger.info("Starting metrics server on http://%s:%d", self.host, self.port)
+        try:
+            await self._server.serve()
+        except SystemExit:
+            # uvicorn exits when it cannot bind; the worker keeps running without the endpoint
+            logger.error("Metrics server could not start on %s:%d", self.host, self.port)
@@ -0,0 +1,18 @@
+from .detector import Detector, result_to_array
+from .extraction import DetectionBatch
+from .metadata import ModelMetadata
+from .pool import InferencePool
+from .roi import plan_regions
+from .scheduler import InferenceScheduler
+from .tracker import CameraTracker
+
+__all__ = [
+    "CameraTracker",
+    "DetectionBatch",
+    "Detector",
+    "InferencePool",
+    "InferenceScheduler",
+    "ModelMetadata",
+    "plan_regions",
+    "result_to_array",
+]
@@ -0,0 +1,161 @@
+"""Shared YOLO detector — one loaded model serving every camera of the worker."""
+
+import logging
+import time
+
+import numpy as np
+
+from .export import resolve_model
+from .metadata import ModelMetadata
+
+logger = logging.getLogger("motionops.inference.detector")
+
+
+def result_to_array(result) -> np.ndarray:
+    """Return a Results object's boxes as an (N, 6) x1, y1, x2, y2, conf, cls array.
+
+    Arrays (as returned by InferencePool) are passed through unchanged.
+    """
+    if isinstance(result, np.ndarray):
+        return result
+    if result is None or result.boxes is None:
+        return np.empty((0, 6), dtype=np.float32)
+    return result.boxes.data.cpu().numpy().reshape(-1, 6)
+
+
+class Detector:
+    """Wraps a single YOLO model instance.
+
+    The model is loaded once per worker process and shared by all camera
+    pipelines. It only runs detection; tracking state lives in each camera's
+    CameraTracker so cameras never share track ids.
+
+    The backend selects the runtime: "torch" loads the .pt weights directly,
+    "onnx" / "openvino" load an exported copy (see export.resolve_model). If the
+    export fails the detector falls back to PyTorch.
+    """
+
+    def __init__(self, model_path: str, backend: str = "torch", int8: bool = False,
+                 imgsz: int = 640, cache_dir: str = "models"):
+        self.model_path = model_path
+        self.backend = backend
+        self.int8 = int8
+        self.imgsz = imgsz
+        self.cache_dir = cache_dir
+        self._model = None
+        self.remote = False  # model lives in InferencePool workers, see attach()
+        self.metadata = ModelMetadata()
+        self.version = 0  # incremented on every successful load or swap
+        self.load_timings: dict[str, float] = {}  # ms per load step: import, export, load
+
+    @classmethod
+    def from_settings(cls, settings) -> "Detector":
+        return cls(
+            settings.model_path,
+            backend=settings.inference_backend,
+            int8=settings.inference_int8,
+            imgsz=settings.inference_size,
+            cache_dir=settings.model_cache_dir,
+        )
+
+    def load(self) -> bool:
+        """Load the YOLO model. Returns True on success."""
+        self.load_timings = {}
+        start = time.perf_counter()
+        try:
+            from ultralytics import YOLO
+        except Exception as e:
+            logger.error("Failed to load YOLO model: %s", e)
+            self._model = None
+            self.metadata = ModelMetadata()
+            return False
+        self.load_timings["import"] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        try:
+            path = resolve_model(self.model_path, self.backend, self.imgsz, self.int8,
+                                 self.cache_dir)
+        except Exception as e:
+            logger.error("Export to %s failed, falling back to torch: %s", self.backend, e)
+            self.backend, path = "torch", self.model_path
+        self.load_timings["export"] = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        try:
+            model = YOLO(path, task="detect")
+            # metadata first: `loaded` turns true with _model, and callers then use both
+            self.metadata = ModelMetadata(model.names)
+            self._model = model
+            self.version += 1
+            self.load_timings["load"] = (time.perf_counter() - start) * 1000
+            logger.info("YOLO model loaded: %s (backend=%s)", path, self.backend)
+            return True
+        except Exception as e:
+            logger.error("Failed to load YOLO model: %s", e)
+            self._model = None
+            self.metadata = ModelMetadata()
+            return False
+
+    def warm_up(self, settings, runs: int = 1) -> list[float]:
+        """Run inference on blank frames so lazy initialization happens off the hot path.
+
+        Returns the duration of each run in ms; the first is the cold one.
+        """
+        frame = np.zeros((settings.inference_size, settings.inference_size, 3), dtype=np.uint8)
+        durations = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            self.predict([frame], settings)
+            durations.append((time.perf_counter() - start) * 1000)
+        return durations
+
+    def swap(self, other: "Detector") -> None:
+        """Take over another (loaded) detector's model in one step.
+
+        Pipelines and the scheduler keep their reference to this object, so the
+        next predict() call uses the new model; calls already running finish on
+        the old one.
+        """
+        self.metadata, self._model = other.metadata, other._model  # loaded only with metadata set
+        self.model_path, self.backend, self.int8 = other.model_path, other.backend, other.int8
+        self.version += 1
+
+    def attach(self, names: dict[int, str], model_path: str, backend: str) -> None:
+        """Adopt a model loaded by InferencePool workers.
+
+        Only the metadata lives in this process; predictions must go through
+        the pool (the scheduler does this when it has one).
+        """
+        self.metadata = ModelMetadata(names)
+        self.model_path, self.backend = model_path, backend
+        self.remote = True
+        self.version += 1
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None or self.remote
+
+    @property
+    def names(self) -> dict[int, str]:
+        return self.metadata.names
+
+    @property
+    def class_names(self) -> np.ndarray:
+        """id → name lookup array."""
+        return self.metadata.class_names
+
+    def predict(self, frames: list[np.ndarray], settings) -> list:
+        """Run detection on one or more frames using the given camera settings.
+
+        With per-class thresholds the model runs at the lowest one; callers
+        filter per class afterwards (see ModelMetadata.confidence_thresholds).
+        """
+        conf = min([settings.detector_confidence, *settings.detector_class_confidence.values()])
+        return self._model.predict(
+            frames,
+            conf=conf,
+            iou=settings.detector_iou,
+            imgsz=settings.inference_size,
+            classes=self.metadata.class_indices(settings.detector_classes),
+            verbose=False,
+        )
@@ -0,0 +1,112 @@
+"""Export YOLO weights to CPU-optimized runtimes and cache the artifacts on disk."""
+
+import contextlib
+import hashlib
+import logging
+import shutil
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # not POSIX: exports are not serialized across processes
+    fcntl = None
+
+logger = logging.getLogger("motionops.inference.export")
+
+BACKENDS = ("torch", "onnx", "openvino")
+
+
+def weights_digest(model_path: str) -> str:
+    """Short content hash of the weights file, or "" when it does not exist (yet).
+
+    Part of the cache key, so replacing the weights under the same name
+    exports them again instead of loading the stale artifact.
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(model_path, "rb") as weights:
+            for chunk in iter(lambda: weights.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError:  # e.g. a hub name Ultralytics downloads on first use
+        return ""
+    return digest.hexdigest()[:12]
+
+
+def artifact_path(model_path: str, backend: str, imgsz: int, int8: bool, cache_dir: str) -> Path:
+    """Where the exported artifact for this (weights, backend, size, precision) lives."""
+    digest = weights_digest(model_path)
+    name = (f"{Path(model_path).stem}{f'-{digest}' if digest else ''}"
+            f"-{imgsz}{'-int8' if int8 else ''}")
+    if backend == "onnx":
+        return Path(cache_dir) / f"{name}.onnx"
+    # Ultralytics recognizes OpenVINO models by the _openvino_model directory suffix
+    return Path(cache_dir) / f"{name}_openvino_model"
+
+
+@contextlib.contextmanager
+def export_lock(model_path: str, cache_dir: str):
+    """Hold an exclusive file lock while exporting `model_path`.
+
+    Pool workers start together and would otherwise export the same weights
+    at once: Ultralytics writes its output next to the .pt file, so they
+    overwrite each other's files and the losers fall back to torch.
+    """
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    with open(Path(cache_dir) / f"{Path(model_path).stem}.export.lock", "w") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        yield  # closing the file releases the lock
+
+
+def resolve_model(model_path: str, backend: str = "torch", imgsz: int = 640,
+                  int8: bool = False, cache_dir: str = "models") -> str:
+    """Return the path YOLO() should load for the requested backend.
+
+    The .pt weights are exported once; later calls reuse the cached artifact.
+    ONNX exports use dynamic axes so batched and ROI inference keep working.
+    INT8 uses NNCF post-training quantization for OpenVINO and dynamic
+    (weight-only) quantization from onnxruntime for ONNX.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown inference backend '{backend}'. Must be one of: {', '.join(BACKENDS)}")
+    if backend == "torch":
+        return model_path
+
+    target = artifact_path(model_path, backend, imgsz, int8, cache_dir)
+    with export_lock(model_path, cache_dir):
+        # Checked under the lock: another process may have just finished the export
+        if target.exists():
+            logger.info("Using cached %s model: %s", backend, target)
+            return str(target)
+        _export(model_path, backend, imgsz, int8, target)
+    return str(target)
+
+
+def _export(model_path: str, backend: str, imgsz: int, int8: bool, target: Path) -> None:
+    """Export the weights to `target` (an .onnx file or an OpenVINO model directory)."""
+    from ultralytics import YOLO
+
+    logger.info("Exporting %s to %s (imgsz=%d, int8=%s)...", model_path, backend, imgsz, int8)
+    model = YOLO(model_path)
+    if backend == "onnx":
+        exported = model.export(format="onnx", imgsz=imgsz, dynamic=True, simplify=True)
+        if int8:
+            import onnx
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            quantize_dynamic(exported, str(target), weight_type=QuantType.QUInt8)
+            # Keep the class names / stride metadata Ultralytics reads back on load
+            quantized = onnx.load(str(target))
+            onnx.helper.set_model_props(
+                quantized, {p.key: p.value for p in onnx.load(exported).metadata_props},
+            )
+            onnx.save(quantized, str(target))
+            Path(exported).unlink(missing_ok=True)
+        else:
+            shutil.move(exported, target)
+    else:
+        exported = model.export(format="openvino", imgsz=imgsz, dynamic=True, int8=int8)
+        shutil.move(exported, target)
+
+    logger.info("Exported model cached at %s", target)
@@ -0,0 +1,105 @@
+"""Vectorized conversion of tracker output into transport payloads."""
+
+from dataclasses import dataclass
+from uuid import uuid4
+
+import numpy as np
+
+
+@dataclass
+class DetectionBatch:
+    """One frame's tracked detections as parallel NumPy columns."""
+    xyxy: np.ndarray  # (N, 4) float32, frame coordinates
+    confidence: np.ndarray  # (N,) float32
+    class_ids: np.ndarray  # (N,) int32
+    class_names: np.ndarray  # (N,) object
+    track_ids: np.ndarray  # (N,) int32
+
+    def __len__(self) -> int:
+        return len(self.confidence)
+
+    @classmethod
+    def empty(cls) -> "DetectionBatch":
+        return cls(
+            xyxy=np.empty((0, 4), dtype=np.float32),
+            confidence=np.empty(0, dtype=np.float32),
+            class_ids=np.empty(0, dtype=np.int32),
+            class_names=np.empty(0, dtype=object),
+            track_ids=np.empty(0, dtype=np.int32),
+        )
+
+    @classmethod
+    def from_tracks(cls, tracks: np.ndarray, names: np.ndarray) -> "DetectionBatch":
+        """Build from CameraTracker output (x1, y1, x2, y2, track_id, conf, cls, idx).
+
+        Args:
+            names: id → class name lookup array (see ModelMetadata.class_names).
+        """
+        if len(tracks) == 0:
+            return cls.empty()
+        class_ids = tracks[:, 6].astype(np.int32)
+        return cls(
+            xyxy=tracks[:, :4],
+            confidence=tracks[:, 5],
+            class_ids=class_ids,
+            class_names=names[class_ids],
+            track_ids=tracks[:, 4].astype(np.int32),
+        )
+
+    def filter(self, keep: np.ndarray) -> "DetectionBatch":
+        """Subset of the batch selected by a boolean mask."""
+        return DetectionBatch(
+            xyxy=self.xyxy[keep],
+            confidence=self.confidence[keep],
+            class_ids=self.class_ids[keep],
+            class_names=self.class_names[keep],
+            track_ids=self.track_ids[keep],
+        )
+
+    def _columns(self) -> tuple[list, list, list, list]:
+        """Bulk-convert to Python lists: class names, confidences, xywh boxes, track ids."""
+        x1y1 = self.xyxy[:, :2]
+        xywh = np.concatenate([x1y1, self.xyxy[:, 2:] - x1y1], axis=1).astype(np.int32)
+        return (
+            self.class_names.tolist(),
+            np.round(self.confidence.astype(np.float64), 3).tolist(),
+            xywh.tolist(),
+            [f"track_{t}" for t in self.track_ids.tolist()],
+        )
+
+    def to_dicts(self) -> list[dict]:
+        """Per-detection objects, the historical `worker:detection` format."""
+        names, confs, boxes, tracks = self._columns()
+        return [
+            {
+                "id": str(uuid4()),
+                "className": name,
+                "confidence": conf,
+                "bbox": {"x": x, "y": y, "w": w, "h": h},
+                "trackId": track,
+            }
+            for name, conf, (x, y, w, h), track in zip(names, confs, boxes, tracks)
+        ]
+
+    def to_tracks(self) -> list[dict]:
+        """Live overlay boxes (`worker:track_update`), in the API's camera:tracks shape."""
+        names, confs, boxes, tracks = self._columns()
+        return [
+            {
+                "id": track,
+                "className": name,
+                "confidence": conf,
+                "box": {"x": x, "y": y, "w": w, "h": h},
+            }
+            for name, conf, (x, y, w, h), track in zip(names, confs, boxes, tracks)
+        ]
+
+    def to_columnar(self) -> dict:
+        """Compact column-oriented form: one list per field, boxes as [x, y, w, h]."""
+        names, confs, boxes, tracks = self._columns()
+        return {
+            "className": names,
+            "confidence": confs,
+            "bbox": boxes,
+            "trackId": tracks,
+        }
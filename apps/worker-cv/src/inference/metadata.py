@@ -0,0 +1,39 @@
+"""Per-model metadata built once when a model is loaded."""
+
+import numpy as np
+
+
+class ModelMetadata:
+    """Class-name lookups and cached class filters for one loaded model.
+
+    A new instance is created every time a model is (re)loaded, so anything
+    derived from it can be invalidated by an identity check.
+    """
+
+    def __init__(self, names: dict[int, str] | None = None):
+        self.names: dict[int, str] = dict(names or {})
+        size = max(self.names) + 1 if self.names else 0
+        # id → name lookup array, for vectorized class-name resolution
+        self.class_names = np.array([self.names.get(i, str(i)) for i in range(size)], dtype=object)
+        self.name_to_id = {name: idx for idx, name in self.names.items()}
+        self._filters: dict[tuple[str, ...], list[int] | None] = {}
+
+    @property
+    def num_classes(self) -> int:
+        return len(self.class_names)
+
+    def class_indices(self, class_names: list[str] | tuple[str, ...]) -> list[int] | None:
+        """Convert class names to model class indices (cached per class list)."""
+        key = tuple(class_names)
+        if key not in self._filters:
+            indices = [self.name_to_id[name] for name in key if name in self.name_to_id]
+            self._filters[key] = indices if indices else None
+        return self._filters[key]
+
+    def confidence_thresholds(self, default: float, per_class: dict[str, float]) -> np.ndarray:
+        """Per-class-id confidence threshold array, `default` where no override is set."""
+        thresholds = np.full(self.num_classes, default, dtype=np.float32)
+        for name, value in per_class.items():
+            if name in self.name_to_id:
+                thresholds[self.name_to_id[name]] = value
+        return thresholds
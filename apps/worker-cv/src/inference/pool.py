@@ -0,0 +1,409 @@
+"""Multi-process inference pool with shared-memory frame handoff."""
+
+import asyncio
+import logging
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from multiprocessing.shared_memory import SharedMemory
+from types import SimpleNamespace
+
+import numpy as np
+
+from .detector import Detector, result_to_array
+
+logger = logging.getLogger("motionops.inference.pool")
+
+LATENCY_SMOOTHING = 0.2  # EMA weight of the newest per-worker latency sample
+POLL_SECONDS = 1.0  # how often the response reader checks that workers are alive
+STOP_TIMEOUT_SECONDS = 5
+SHM_DIR = "/dev/shm"
+SHM_HEADROOM = 0.8  # share of the free /dev/shm space the frame ring may take
+
+# Settings fields a worker needs to load the model and run predict()
+LOAD_FIELDS = ("model_path", "inference_backend", "inference_int8", "inference_size",
+               "model_cache_dir", "warmup_runs")
+PREDICT_FIELDS = ("detector_confidence", "detector_iou", "inference_size",
+                  "detector_classes", "detector_class_confidence")
+
+
+def pool_size(workers: int, threads_per_worker: int) -> int:
+    """Resolve the configured worker count; -1 scales with the number of cores."""
+    if workers >= 0:
+        return workers
+    return max(1, (os.cpu_count() or 1) // max(1, threads_per_worker))
+
+
+def shm_free_bytes() -> int | None:
+    """Free space on /dev/shm, or None where it cannot be measured."""
+    try:
+        stat = os.statvfs(SHM_DIR)
+    except (AttributeError, OSError):  # not Linux, or no /dev/shm
+        return None
+    return stat.f_bavail * stat.f_frsize
+
+
+def fit_slots(slots: int, slot_bytes: int) -> int:
+    """Cap the slot count to what /dev/shm can hold.
+
+    POSIX shared memory is allocated lazily, so an oversized ring is created
+    fine and then kills the process with SIGBUS on the first frame written to
+    a page that does not fit — check the size up front instead.
+    """
+    slots = max(1, slots)
+    free = shm_free_bytes()
+    if free is None or slots * slot_bytes <= free * SHM_HEADROOM:
+        return slots
+    fit = int(free * SHM_HEADROOM) // slot_bytes
+    if fit < 1:
+        raise RuntimeError(
+            f"{SHM_DIR} has {free // 2**20} MB free, not enough for one {slot_bytes // 2**20} MB "
+            f"inference slot; raise the container's shm_size, lower inference_slot_bytes "
+            f"or set inference_workers=0")
+    logger.warning("Inference frame ring capped to %d of %d slots (%d MB free on %s)",
+                   fit, slots, free // 2**20, SHM_DIR)
+    return fit
+
+
+@dataclass
+class LoadResult:
+    """What a worker reports after (re)loading the model."""
+    ok: bool
+    names: dict[int, str] = field(default_factory=dict)
+    backend: str = "torch"
+    timings: dict[str, float] = field(default_factory=dict)
+    warmup_ms: list[float] = field(default_factory=list)  # duration of each warm-up run
+    error: str | None = None
+
+
+def _check_backends(load: dict, results: list[LoadResult]) -> None:
+    """Warn when workers run another backend than requested, or not all the same one.
+
+    A worker whose export fails falls back to torch on its own; the pool then
+    serves mixed latencies and results without saying so.
+    """
+    backends = [r.backend for r in results if r.ok]
+    if any(backend != load["inference_backend"] for backend in backends):
+        logger.warning("Inference workers asked for %s run %s",
+                       load["inference_backend"], ", ".join(backends))
+
+
+@dataclass
+class _Worker:
+    """Parent-side view of one inference process."""
+    index: int
+    process: mp.Process
+    requests: mp.Queue
+    ready: bool = False
+    in_flight: int = 0
+    frames: int = 0
+    latency_ms: float = 0.0
+    pending: dict[int, asyncio.Future] = field(default_factory=dict)
+    loading: asyncio.Future | None = None
+
+
+def _worker_main(index: int, load: dict, shm_name: str, slot_bytes: int,
+                 requests: mp.Queue, responses: mp.Queue, threads: int) -> None:
+    """Inference process: load the model, then serve predict requests until told to stop."""
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except Exception:
+        pass
+
+    shm = SharedMemory(name=shm_name)
+    detector = Detector(load["model_path"], backend=load["inference_backend"],
+                        int8=load["inference_int8"], imgsz=load["inference_size"],
+                        cache_dir=load["model_cache_dir"])
+    responses.put(("loaded", index, _load(detector, load)))
+
+    while True:
+        message = requests.get()
+        if message is None:
+            break
+        kind, payload = message
+        if kind == "load":
+            candidate = Detector(payload["model_path"], backend=payload["inference_backend"],
+                                 int8=payload["inference_int8"], imgsz=payload["inference_size"],
+                                 cache_dir=payload["model_cache_dir"])
+            result = _load(candidate, payload)
+            if result.ok:
+                detector.swap(candidate)
+            responses.put(("loaded", index, result))
+            continue
+
+        request_id, specs, settings = payload
+        frames = [
+            np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=slot * slot_bytes)
+            if slot is not None else inline
+            for slot, shape, dtype, inline in specs
+        ]
+        start = time.perf_counter()
+        results = None
+        try:
+            results = detector.predict(frames, SimpleNamespace(**settings))
+            arrays, error = [result_to_array(r).copy() for r in results], None
+        except Exception as e:
+            arrays, error = None, str(e)
+        latency_ms = (time.perf_counter() - start) * 1000
+        # Results keep a reference to their input; drop every view before the slots are reused
+        del frames, results
+        responses.put(("result", index, (request_id, arrays, latency_ms, error)))
+
+    shm.close()
+
+
+def _load(detector: Detector, load: dict) -> LoadResult:
+    if not detector.load():
+        return LoadResult(ok=False, error=f"Failed to load model {load['model_path']}")
+    warmup_ms = []
+    if load["warmup_runs"] > 0:
+        try:
+            warmup_ms = detector.warm_up(SimpleNamespace(**load["predict"]), load["warmup_runs"])
+        except Exception as e:
+            return LoadResult(ok=False, error=f"Warm-up failed: {e}")
+    return LoadResult(ok=True, names=detector.names, backend=detector.backend,
+                      timings=detector.load_timings, warmup_ms=warmup_ms)
+
+
+class InferencePool:
+    """Runs detection in N worker processes, each with its own copy of the model.
+
+    Frames are copied once into a ring of shared-memory slots and the workers
+    read them in place, so only slot indices and shapes cross the process
+    boundary. Frames larger than a slot, or submitted while every slot is
+    busy, are pickled instead. Each request goes to the worker with the fewest
+    frames in flight. Results come back as (N, 6) arrays (see result_to_array).
+
+    The parent process keeps capture, motion and transport; a dead worker
+    fails its in-flight requests and is restarted.
+
+    Usage:
+        pool = InferencePool(workers=4, threads_per_worker=2, slots=32)
+        result = await pool.start(settings)
+        arrays = await pool.predict(frames, settings)
+        await pool.close()
+    """
+
+    def __init__(self, workers: int, threads_per_worker: int = 2, slots: int = 16,
+                 slot_bytes: int = 1920 * 1080 * 3):
+        self.size = max(1, workers)
+        self.threads_per_worker = max(1, threads_per_worker)
+        self.slot_bytes = slot_bytes
+        self._ctx = mp.get_context("spawn")  # torch and OpenCV threads do not survive fork
+        slots = fit_slots(slots, slot_bytes)
+        self._shm = SharedMemory(create=True, size=slots * slot_bytes)
+        self._free_slots = list(range(slots))
+        self._requests: dict[int, tuple[list[int], int]] = {}  # request id → (slots, frame count)
+        self._responses = self._ctx.Queue()
+        self._workers: list[_Worker] = []
+        self._load: dict | None = None
+        self._next_id = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._reader: threading.Thread | None = None
+        self._closed = False
+        self.pickled_frames = 0
+
+    @classmethod
+    def from_settings(cls, settings) -> "InferencePool":
+        workers = pool_size(settings.inference_workers, settings.inference_threads)
+        return cls(
+            workers=workers,
+            threads_per_worker=settings.inference_threads,
+            slots=settings.inference_slots or 2 * workers * settings.inference_batch_size,
+            slot_bytes=settings.inference_slot_bytes,
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        """Frames submitted to workers and not yet answered."""
+        return sum(w.in_flight for w in self._workers)
+
+    async def start(self, settings) -> LoadResult:
+        """Spawn the workers and wait until each one has loaded (or failed to load) the model."""
+        self._loop = asyncio.get_running_loop()
+        self._load = self._load_params(settings)
+        self._reader = threading.Thread(target=self._read_responses, name="inference-pool-reader",
+                                        daemon=True)
+        self._reader.start()
+        for index in range(self.size):
+            self._workers.append(self._spawn(index))
+        results = await asyncio.gather(*(w.loading for w in self._workers))
+        loaded = [r for r in results if r.ok]
+        logger.info("Inference pool started: %d/%d workers loaded %s (%d threads each)",
+                    len(loaded), self.size, self._load["model_path"], self.threads_per_worker)
+        _check_backends(self._load, results)
+        return loaded[0] if loaded else results[0]
+
+    async def reload(self, settings) -> LoadResult:
+        """Load a new model into each worker in turn; the others keep serving meanwhile."""
+        load = self._load_params(settings)
+        results = []
+        for worker in self._workers:
+            worker.loading = self._loop.create_future()
+            worker.in_flight += 1  # steer requests to the other workers while this one loads
+            worker.requests.put(("load", load))
+            try:
+                result = await worker.loading
+            finally:
+                worker.in_flight = max(0, worker.in_flight - 1)
+            if not result.ok:
+                return result
+            results.append(result)
+        if not results:
+            return LoadResult(ok=False, error="No inference workers")
+        self._load = load
+        _check_backends(load, results)
+        return results[-1]
+
+    async def predict(self, frames: list[np.ndarray], settings) -> list[np.ndarray]:
+        """Run detection on the least busy worker and return one (N, 6) array per frame."""
+        candidates = [w for w in self._workers if w.ready]
+        if not candidates:
+            raise RuntimeError("No inference worker available")
+        worker = min(candidates, key=lambda w: w.in_flight)
+
+        request_id = self._next_id
+        self._next_id += 1
+        specs, slots = [], []
+        for frame in frames:
+            if frame.nbytes <= self.slot_bytes and self._free_slots:
+                slot = self._free_slots.pop()
+                np.ndarray(frame.shape, dtype=frame.dtype, buffer=self._shm.buf,
+                           offset=slot * self.slot_bytes)[...] = frame
+                specs.append((slot, frame.shape, frame.dtype.str, None))
+                slots.append(slot)
+            else:
+                specs.append((None, frame.shape, frame.dtype.str, frame))
+                self.pickled_frames += 1
+        self._requests[request_id] = (slots, len(frames))
+
+        future = self._loop.create_future()
+        worker.pending[request_id] = future
+        worker.in_flight += len(frames)
+        worker.requests.put(("predict", (request_id, specs, self._predict_params(settings))))
+        return await future
+
+    def stats(self) -> list[dict]:
+        """Per-worker queue depth and latency, for worker:health."""
+        return [
+            {
+                "worker": w.index,
+                "pid": w.process.pid,
+                "alive": w.process.is_alive(),
+                "ready": w.ready,
+                "queueDepth": w.in_flight,
+                "latencyMs": round(w.latency_ms, 2),
+                "frames": w.frames,
+            }
+            for w in self._workers
+        ]
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        for worker in self._workers:
+            worker.requests.put(None)
+        loop = asyncio.get_running_loop()
+        for worker in self._workers:
+            await loop.run_in_executor(None, worker.process.join, STOP_TIMEOUT_SECONDS)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            self._fail_pending(worker, RuntimeError("Inference pool closed"))
+        self._responses.put(None)
+        if self._reader is not None:
+            await loop.run_in_executor(None, self._reader.join, STOP_TIMEOUT_SECONDS)
+        self._shm.close()
+        self._shm.unlink()
+
+    def _spawn(self, index: int) -> _Worker:
+        requests = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(index, self._load, self._shm.name, self.slot_bytes, requests,
+                  self._responses, self.threads_per_worker),
+            name=f"inference-{index}",
+            daemon=True,
+        )
+        process.start()
+        worker = _Worker(index=index, process=process, requests=requests)
+        worker.loading = self._loop.create_future()
+        return worker
+
+    def _read_responses(self) -> None:
+        """Reader thread: hand worker responses to the event loop, watch for dead workers."""
+        while True:
+            try:
+                message = self._responses.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                if not self._closed:
+                    self._loop.call_soon_threadsafe(self._check_workers)
+                continue
+            if message is None:
+                return
+            self._loop.call_soon_threadsafe(self._on_response, message)
+
+    def _on_response(self, message: tuple) -> None:
+        kind, index, payload = message
+        worker = self._workers[index]
+        if kind == "loaded":
+            worker.ready = worker.ready or payload.ok
+            if not payload.ok:
+                logger.error("Inference worker %d: %s", index, payload.error)
+            if worker.loading is not None and not worker.loading.done():
+                worker.loading.set_result(payload)
+            worker.loading = None
+            return
+
+        request_id, arrays, latency_ms, error = payload
+        slots, frames = self._requests.pop(request_id, ([], 0))
+        self._free_slots.extend(slots)
+        worker.in_flight = max(0, worker.in_flight - frames)
+        future = worker.pending.pop(request_id, None)
+        if future is None or future.done():
+            return
+        if error is not None:
+            future.set_exception(RuntimeError(f"Inference worker {index}: {error}"))
+            return
+        worker.frames += frames
+        worker.latency_ms = (latency_ms if worker.latency_ms == 0
+                             else (1 - LATENCY_SMOOTHING) * worker.latency_ms
+                             + LATENCY_SMOOTHING * latency_ms)
+        future.set_result(arrays)
+
+    def _check_workers(self) -> None:
+        """Restart workers that died, failing whatever they had in flight."""
+        if self._closed:
+            return
+        for i, worker in enumerate(self._workers):
+            if worker.process.is_alive():
+                continue
+            logger.error("Inference worker %d exited (code %s), restarting",
+                         worker.index, worker.process.exitcode)
+            self._fail_pending(worker, RuntimeError(f"Inference worker {worker.index} died"))
+            self._workers[i] = self._spawn(worker.index)
+
+    def _fail_pending(self, worker: _Worker, error: Exception) -> None:
+        for request_id, future in worker.pending.items():
+            self._free_slots.extend(self._requests.pop(request_id, ([], 0))[0])
+            if not future.done():
+                future.set_exception(error)
+        worker.pending.clear()
+        worker.in_flight = 0
+        if worker.loading is not None and not worker.loading.done():
+            worker.loading.set_result(LoadResult(ok=False, error=str(error)))
+
+    @staticmethod
+    def _predict_params(settings) -> dict:
+        return {name: getattr(settings, name) for name in PREDICT_FIELDS}
+
+    @classmethod
+    def _load_params(cls, settings) -> dict:
+        params = {name: getattr(settings, name) for name in LOAD_FIELDS}
+        params["predict"] = cls._predict_params(settings)
+        return params
@@ -0,0 +1,87 @@
+"""Region-of-interest planning: turn motion boxes into a few padded crops."""
+
+import numpy as np
+
+
+def plan_regions(boxes: np.ndarray, frame_shape: tuple[int, int], padding: float = 0.2,
+                 min_size: int = 160, max_regions: int = 4,
+                 max_coverage: float = 0.5) -> np.ndarray | None:
+    """Merge motion boxes into at most `max_regions` padded, non-overlapping crops.
+
+    Args:
+        boxes: (N, 4) x1, y1, x2, y2 in full-resolution frame coordinates.
+        frame_shape: (height, width) of the full-resolution frame.
+        padding: Margin added around each box, as a fraction of its size.
+        min_size: Minimum crop side in pixels, so tiny blobs keep some context.
+        max_regions: Upper bound on the number of crops.
+        max_coverage: If the crops cover more than this fraction of the frame,
+            cropping saves nothing and None is returned (use the full frame).
+
+    Returns:
+        (M, 4) int array of crops, or None when the full frame should be used.
+    """
+    if len(boxes) == 0:
+        return np.empty((0, 4), dtype=np.int32)
+    h, w = frame_shape
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+
+    # Pad, then grow to min_size around the box centre
+    size = boxes[:, 2:] - boxes[:, :2]
+    centre = (boxes[:, :2] + boxes[:, 2:]) / 2
+    half = np.maximum(size * (1 + 2 * padding), min_size) / 2
+    regions = np.concatenate([centre - half, centre + half], axis=1)
+    regions = _clip(regions, w, h)
+
+    regions = _merge_overlapping(regions)
+    while len(regions) > max_regions:
+        regions = _merge_closest_pair(regions)
+
+    area = ((regions[:, 2] - regions[:, 0]) * (regions[:, 3] - regions[:, 1])).sum()
+    if area > max_coverage * w * h:
+        return None
+    return regions.round().astype(np.int32)
+
+
+def _clip(regions: np.ndarray, w: int, h: int) -> np.ndarray:
+    regions[:, [0, 2]] = regions[:, [0, 2]].clip(0, w)
+    regions[:, [1, 3]] = regions[:, [1, 3]].clip(0, h)
+    return regions
+
+
+def _union(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.array([min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])],
+                    dtype=np.float32)
+
+
+def _merge_overlapping(regions: np.ndarray) -> np.ndarray:
+    """Repeatedly union intersecting regions until none intersect."""
+    merged = list(regions)
+    changed = True
+    while changed and len(merged) > 1:
+        changed = False
+        for i in range(len(merged)):
+            for j in range(i + 1, len(merged)):
+                a, b = merged[i], merged[j]
+                if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                    merged[i] = _union(a, b)
+                    del merged[j]
+                    changed = True
+                    break
+            if changed:
+                break
+    return np.asarray(merged, dtype=np.float32).reshape(-1, 4)
+
+
+def _merge_closest_pair(regions: np.ndarray) -> np.ndarray:
+    """Union the pair of regions whose union adds the least area."""
+    best, best_cost = (0, 1), np.inf
+    areas = (regions[:, 2] - regions[:, 0]) * (regions[:, 3] - regions[:, 1])
+    for i in range(len(regions)):
+        for j in range(i + 1, len(regions)):
+            u = _union(regions[i], regions[j])
+            cost = (u[2] - u[0]) * (u[3] - u[1]) - areas[i] - areas[j]
+            if cost < best_cost:
+                best, best_cost = (i, j), cost
+    i, j = best
+    rest = [r for k, r in enumerate(regions) if k not in best]
+    return _merge_overlapping(np.asarray([_union(regions[i], regions[j]), *rest], dtype=np.float32))
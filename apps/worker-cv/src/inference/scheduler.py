@@ -0,0 +1,139 @@
+"""Cross-camera batched inference scheduler."""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .detector import Detector
+from .pool import InferencePool
+
+logger = logging.getLogger("motionops.inference.scheduler")
+
+
+@dataclass
+class _Batch:
+    """Frames waiting for the same detector settings."""
+    settings: object
+    frames: list[np.ndarray] = field(default_factory=list)
+    futures: list[asyncio.Future] = field(default_factory=list)
+    submissions: int = 0
+    timer: asyncio.TimerHandle | None = None
+
+
+class InferenceScheduler:
+    """Collects frames from several cameras into one batched predict call.
+
+    A batch is flushed when it reaches `max_batch` frames, when every registered
+    producer has a frame waiting (each pipeline awaits its result, so the batch
+    cannot grow further), or when the oldest frame has waited `deadline_ms`.
+    Frames are grouped by detector settings so per-camera confidence, IoU,
+    input size and class filters are honoured. With a pool, batches run in its
+    worker processes and resolve to (N, 6) arrays instead of Results objects;
+    without one, predict runs on a single inference thread so the event loop
+    is never blocked by the model.
+
+    Usage:
+        scheduler = InferenceScheduler(detector, max_batch=8, deadline_ms=40)
+        scheduler.register()
+        result = await scheduler.submit(frame, settings)
+    """
+
+    def __init__(self, detector: Detector, max_batch: int = 8, deadline_ms: float = 40,
+                 pool: InferencePool | None = None):
+        self.detector = detector
+        self.pool = pool
+        self._executor = (ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+                          if pool is None else None)
+        self.max_batch = max(1, max_batch)
+        self.deadline_ms = deadline_ms
+        self._batches: dict[tuple, _Batch] = {}
+        self._producers = 0
+        self.batches_run = 0
+        self.frames_run = 0
+        self.last_batch_ms = 0.0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.frames_run / self.batches_run if self.batches_run else 0.0
+
+    def register(self) -> None:
+        """Declare a camera that will submit frames."""
+        self._producers += 1
+
+    def unregister(self) -> None:
+        self._producers = max(0, self._producers - 1)
+        # A departing producer may have been the one a pending batch was waiting for
+        for key in list(self._batches):
+            if self._is_full(self._batches[key]):
+                self._flush(key)
+
+    async def submit(self, frame: np.ndarray, settings):
+        """Queue a frame for detection and wait for its Results object."""
+        results = await self.submit_many([frame], settings)
+        return results[0]
+
+    async def submit_many(self, frames: list[np.ndarray], settings) -> list:
+        """Queue several images from one producer (e.g. ROI crops) in the same batch."""
+        loop = asyncio.get_running_loop()
+        key = self._batch_key(settings)
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = _Batch(settings=settings)
+            batch.timer = loop.call_later(self.deadline_ms / 1000, self._flush, key)
+
+        futures = [loop.create_future() for _ in frames]
+        batch.frames.extend(frames)
+        batch.futures.extend(futures)
+        batch.submissions += 1
+        if self._is_full(batch):
+            self._flush(key)
+        return list(await asyncio.gather(*futures))
+
+    def _is_full(self, batch: _Batch) -> bool:
+        waiting = sum(b.submissions for b in self._batches.values())
+        return len(batch.frames) >= self.max_batch or waiting >= self._producers
+
+    @staticmethod
+    def _batch_key(settings) -> tuple:
+        return (
+            settings.detector_confidence,
+            settings.detector_iou,
+            settings.inference_size,
+            tuple(settings.detector_classes),
+            tuple(sorted(settings.detector_class_confidence.items())),
+        )
+
+    def _flush(self, key: tuple) -> None:
+        batch = self._batches.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        asyncio.get_running_loop().create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch: _Batch) -> None:
+        start = time.monotonic()
+        try:
+            if self.pool is not None:
+                results = await self.pool.predict(batch.frames, batch.settings)
+            else:
+                results = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self.detector.predict, batch.frames, batch.settings,
+                )
+        except Exception as e:
+            logger.error("Batched inference failed (%d frames): %s", len(batch.frames), e)
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches_run += 1
+        self.frames_run += len(batch.frames)
+        self.last_batch_ms = (time.monotonic() - start) * 1000
+        for future, result in zip(batch.futures, results):
+            if not future.done():
+                future.set_result(result)
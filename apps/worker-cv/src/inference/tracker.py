@@ -0,0 +1,89 @@
+"""Per-camera ByteTrack state."""
+
+import inspect
+import itertools
+import logging
+from types import SimpleNamespace
+
+import numpy as np
+
+logger = logging.getLogger("motionops.inference.tracker")
+
+
+class CameraTracker:
+    """ByteTrack instance owned by a single camera pipeline.
+
+    `YOLO.track(persist=True)` keeps tracker state on the model, which breaks as
+    soon as several cameras share one model. Each pipeline therefore feeds the
+    shared detector's results into its own BYTETracker.
+
+    Track ids come from a counter owned by this camera: older Ultralytics
+    releases draw them from a process-wide counter that every new tracker
+    resets, which would hand out ids still in use by other tracks. A tracker
+    replacing another one on the same camera starts at `first_id`.
+    """
+
+    def __init__(self, settings, frame_rate: float = 30, first_id: int = 1):
+        from ultralytics.engine.results import Boxes
+        from ultralytics.trackers.byte_tracker import BYTETracker
+
+        # Mirrors ultralytics' bytetrack.yaml, with buffer/match from Settings
+        args = SimpleNamespace(
+            tracker_type="bytetrack",
+            track_high_thresh=0.25,
+            track_low_thresh=0.1,
+            new_track_thresh=0.25,
+            track_buffer=settings.tracking_buffer,
+            match_thresh=settings.tracking_match_threshold,
+            fuse_score=True,
+        )
+        if "frame_rate" in inspect.signature(BYTETracker.__init__).parameters:
+            self._tracker = BYTETracker(args, frame_rate=int(frame_rate))
+        else:
+            # Newer releases count track_buffer in frames; keep it meaning 30 fps-frames
+            args.track_buffer = max(1, int(frame_rate / 30.0 * settings.tracking_buffer))
+            self._tracker = BYTETracker(args)
+        self._boxes = Boxes
+        self.last_id = first_id - 1  # last track id handed out
+        self._ids = self._count_ids(first_id)
+        if hasattr(self._tracker, "_ids"):
+            # Newer releases already keep a counter per tracker; make it ours
+            self._tracker._ids = self._ids
+        else:
+            init_track = self._tracker.init_track
+
+            def init_track_with_camera_ids(*args, **kwargs):
+                tracks = init_track(*args, **kwargs)
+                for track in tracks:
+                    track.next_id = self._next_id
+                return tracks
+
+            self._tracker.init_track = init_track_with_camera_ids
+
+    def _count_ids(self, first_id: int):
+        for track_id in itertools.count(first_id):
+            self.last_id = track_id
+            yield track_id
+
+    def _next_id(self) -> int:
+        return next(self._ids)
+
+    def update(self, detections: np.ndarray, frame: np.ndarray) -> np.ndarray:
+        """Update tracks with one frame's detections.
+
+        Args:
+            detections: (N, 6) x1, y1, x2, y2, conf, cls in frame coordinates.
+
+        Returns an (N, 8) array: x1, y1, x2, y2, track_id, conf, cls, det_index.
+        """
+        detections = np.asarray(detections, dtype=np.float32).reshape(-1, 6)
+        boxes = self._boxes(detections, frame.shape[:2])
+        tracks = self._tracker.update(boxes, frame)
+        return np.asarray(tracks, dtype=np.float32).reshape(-1, 8)
+
+    def reset(self) -> None:
+        self._tracker.reset()
+        self.last_id = 0
+        self._ids = self._count_ids(1)
+        if hasattr(self._tracker, "_ids"):
+            self._tracker._ids = self._ids
@@ -0,0 +1,58 @@
+"""Measure how long a coroutine holds the event loop between suspensions."""
+
+import time
+import types
+
+
+class LoopBlockTimer:
+    """Runs a coroutine and accumulates the time its steps block the event loop.
+
+    A coroutine only hands the loop back when an await actually suspends, so
+    the time spent inside each resume is time during which no other camera,
+    Socket.IO heartbeat or config acknowledgement can run.
+
+    One timer may drive several concurrent coroutines (e.g. pipeline stages);
+    their steps never overlap on the loop, so the total stays exact.
+
+    Usage:
+        timer = LoopBlockTimer()
+        await timer.run(frame_loop())
+        # inside frame_loop():
+        mark = timer.elapsed()
+        ...
+        blocked_seconds = timer.elapsed() - mark
+    """
+
+    def __init__(self):
+        self._busy = 0.0
+        self._step_start: float | None = None
+
+    def elapsed(self) -> float:
+        """Total seconds spent on the event loop so far, including the current step."""
+        if self._step_start is None:
+            return self._busy
+        return self._busy + time.perf_counter() - self._step_start
+
+    async def run(self, coro):
+        """Drive `coro` to completion, timing each resume; returns its result."""
+        return await self._drive(coro)
+
+    @types.coroutine
+    def _drive(self, coro):
+        value, error = None, None
+        while True:
+            self._step_start = time.perf_counter()
+            try:
+                yielded = coro.throw(error) if error is not None else coro.send(value)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                self._busy += time.perf_counter() - self._step_start
+                self._step_start = None
+            try:
+                value, error = (yield yielded), None
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as e:  # cancellation and errors go to the wrapped coroutine
+                value, error = None, e
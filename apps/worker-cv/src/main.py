@@ -3,9 +3,7 @@
 import asyncio
 import logging
 
-from .config import Settings
-from .pipeline import Pipeline
-from .transport import SocketTransport
+from .startup import StartupProfiler
 
 logging.basicConfig(
     level=logging.INFO,
@@ -15,20 +13,49 @@ logger = logging.getLogger("motionops.worker")
 
 
 async def main() -> None:
-    settings = Settings()
+    startup = StartupProfiler()
+    # Config imports pull in OpenCV, NumPy and pydantic; time them too
+    with startup.phase("imports_config"):
+        from .config import Settings
+        from .transport import SocketTransport
+    with startup.phase("settings"):
+        settings = Settings()
     logger.info("Starting MotionOps Worker-CV")
     logger.info(f"API URL: {settings.api_url}")
 
-    transport = SocketTransport(settings.api_url, api_key=settings.api_key)
-    await transport.connect()
+    # The rest of the pipeline stack, in its own timed phase
+    with startup.phase("imports"):
+        from .supervisor import Supervisor
 
-    pipeline = Pipeline(settings=settings, transport=transport)
+    transport = SocketTransport(
+        settings.api_url,
+        api_key=settings.api_key,
+        batch_interval_ms=settings.emit_batch_interval_ms,
+        batch_max_items=settings.emit_batch_max_items,
+        queue_size=settings.outbound_queue_size,
+        spool_path=settings.spool_path,
+        spool_max_bytes=settings.spool_max_bytes,
+    )
+    with startup.phase("transport_connect"):
+        await transport.connect()
+
+    supervisor = Supervisor(settings=settings, transport=transport, startup=startup)
+
+    metrics_server = None
+    if settings.metrics_port:
+        from .http_server import MetricsServer
+
+        metrics_server = MetricsServer(supervisor, settings.metrics_host, settings.metrics_port)
+        await metrics_server.start()
 
     try:
-        await pipeline.run()
+        await supervisor.run()
     except KeyboardInterrupt:
         logger.info("Shutting down...")
     finally:
+        await supervisor.stop()
+        if metrics_server is not None:
+            await metrics_server.stop()
         await transport.disconnect()
 
 
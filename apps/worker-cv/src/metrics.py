@@ -0,0 +1,266 @@
+"""Rolling latency histograms, counters and process resources for worker:health and /metrics."""
+
+import contextlib
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+import psutil
+
+# Per-camera latency histograms, in frame order
+LATENCY_STAGES = ("capture", "decode", "motion", "inference", "extraction", "emit")
+PERCENTILES = (50, 95, 99)
+
+HISTOGRAM_SAMPLES = 1024  # most recent samples kept per histogram
+FPS_WINDOW_SECONDS = 5.0
+
+
+class RollingHistogram:
+    """The last `capacity` durations (ms) in a ring buffer, with percentile queries.
+
+    Lock-free: each histogram has a single writer (one stage or thread) and
+    readers only copy the filled part of the ring. A reader racing the writer
+    may see one sample from the previous lap, which does not move percentiles.
+    """
+
+    def __init__(self, capacity: int = HISTOGRAM_SAMPLES):
+        self._samples = np.zeros(max(1, capacity), dtype=np.float64)
+        self._written = 0
+
+    @property
+    def count(self) -> int:
+        """Samples recorded since creation (not capped by the ring size)."""
+        return self._written
+
+    def record(self, value_ms: float) -> None:
+        self._samples[self._written % len(self._samples)] = value_ms
+        self._written += 1
+
+    def record_since(self, start: float) -> None:
+        """Record the time elapsed since a `time.monotonic()` mark."""
+        self.record((time.monotonic() - start) * 1000)
+
+    def samples(self) -> np.ndarray:
+        return self._samples[:min(self._written, len(self._samples))].copy()
+
+    def percentiles(self) -> dict:
+        """{"p50", "p95", "p99"} in ms over the samples in the ring (zeros when empty)."""
+        return summarize(self.samples())
+
+
+def summarize(samples: np.ndarray) -> dict:
+    """p50/p95/p99 of a set of durations, rounded for the wire."""
+    if not len(samples):
+        return {f"p{q}": 0.0 for q in PERCENTILES}
+    values = np.percentile(samples, PERCENTILES)
+    return {f"p{q}": round(float(v), 2) for q, v in zip(PERCENTILES, values)}
+
+
+class RateMeter:
+    """Events per second over a sliding window (single writer)."""
+
+    def __init__(self, window_seconds: float = FPS_WINDOW_SECONDS):
+        self.window_seconds = window_seconds
+        self._ticks: deque[float] = deque()
+
+    def tick(self, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        self._ticks.append(now)
+        while self._ticks and now - self._ticks[0] > self.window_seconds:
+            self._ticks.popleft()
+
+    def rate(self, now: float | None = None) -> float:
+        """Observed rate; 0 once no event arrived for a full window."""
+        now = time.monotonic() if now is None else now
+        ticks = list(self._ticks)
+        if len(ticks) < 2 or now - ticks[-1] > self.window_seconds:
+            return 0.0
+        return (len(ticks) - 1) / (ticks[-1] - ticks[0]) if ticks[-1] > ticks[0] else 0.0
+
+
+class CameraMetrics:
+    """Latency histograms per stage and the analyzed frame rate of one camera.
+
+    - capture: wait for the next frame from the source
+    - decode: the source's decode of an analyzed frame (OpenCV retrieve)
+    - motion: motion analysis on the motion thread
+    - inference: model call, including the batching wait of the scheduler
+    - extraction: mapping results to frame boxes, class filtering and ByteTrack
+    - emit: sending detections and track events
+    """
+
+    def __init__(self, capacity: int = HISTOGRAM_SAMPLES):
+        self.histograms = {stage: RollingHistogram(capacity) for stage in LATENCY_STAGES}
+        self.fps = RateMeter()
+
+    def record_since(self, stage: str, start: float) -> None:
+        self.histograms[stage].record_since(start)
+
+    def snapshot(self) -> dict:
+        return {
+            "fps": round(self.fps.rate(), 2),
+            "latency": {stage: {**h.percentiles(), "count": h.count}
+                        for stage, h in self.histograms.items()},
+        }
+
+
+@dataclass
+class PipelineCounters:
+    """Cumulative per-camera counts kept by the pipeline (frames and drops come from the source)."""
+    frames_gated: int = 0  # frames the motion gate kept away from the detector
+    inferences: int = 0  # frames sent to the detector
+    detections: int = 0  # tracked detections emitted
+    emits: int = 0  # events sent to the transport (detections, motion, track events)
+    detection_errors: int = 0  # frames whose detection or tracking raised
+    reconnects: int = 0
+
+
+class ProcessMetrics:
+    """CPU, RSS and uptime of the worker process and its children (inference pool workers).
+
+    CPU is the share of the whole machine used since the previous sample
+    (psutil's non-blocking mode), so sampling never sleeps. A child seen for
+    the first time only sets its CPU baseline and counts from the next sample.
+
+    Each sample resets those baselines, so only one caller (the health loop)
+    samples; everyone else reads ``last``, the most recent result.
+    """
+
+    def __init__(self):
+        self._process = psutil.Process()
+        self._process.cpu_percent(None)  # first call only sets the baseline
+        self._children: dict[int, psutil.Process] = {}
+        self._cpu_count = psutil.cpu_count() or 1
+        self.started_at = time.monotonic()
+        self.last = self.sample()
+
+    @property
+    def uptime_seconds(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def _processes(self) -> list[psutil.Process]:
+        """This process and its live children, reusing the objects that hold CPU baselines."""
+        children = {}
+        for child in self._process.children(recursive=True):
+            known = self._children.get(child.pid)
+            if known is None:
+                with contextlib.suppress(psutil.Error):
+                    child.cpu_percent(None)
+                known = child
+            children[child.pid] = known
+        self._children = children
+        return [self._process, *children.values()]
+
+    def sample(self) -> dict:
+        """Measure now and store the result in ``last``. Call from one thread only."""
+        cpu, rss = 0.0, 0
+        processes = self._processes()
+        for process in processes:
+            try:
+                with process.oneshot():
+                    cpu += process.cpu_percent(None)
+                    rss += process.memory_info().rss
+            except psutil.Error:  # exited since it was listed
+                continue
+        self.last = {
+            "cpuPercent": round(cpu / self._cpu_count, 1),
+            "ramMb": round(rss / (1024 * 1024)),
+            "rssBytes": rss,
+            "gpuPercent": gpu_percent(),
+            "uptimeSeconds": round(self.uptime_seconds),
+            "processes": len(processes),
+        }
+        return self.last
+
+
+def gpu_percent() -> float:
+    """CUDA utilization when torch is already loaded with a GPU, else 0.
+
+    Never imports torch itself: the pool may keep it out of this process.
+    """
+    torch = sys.modules.get("torch")
+    if torch is None:
+        return 0.0
+    try:
+        return float(torch.cuda.utilization()) if torch.cuda.is_available() else 0.0
+    except Exception:  # needs pynvml; not worth failing health over
+        return 0.0
+
+
+# Prometheus name, type, help and snapshot key of each exported series
+_PROCESS_SERIES = (
+    ("motionops_worker_uptime_seconds", "gauge",
+     "Seconds since the worker started.", "uptimeSeconds"),
+    ("motionops_worker_cpu_percent", "gauge",
+     "CPU usage of the worker and its child processes, share of all cores.", "cpuPercent"),
+    ("motionops_worker_rss_bytes", "gauge",
+     "Resident memory of the worker and its child processes.", "rssBytes"),
+    ("motionops_worker_processes", "gauge",
+     "Worker processes counted (main process plus inference workers).", "processes"),
+    ("motionops_worker_gpu_percent", "gauge", "GPU utilization when CUDA is in use.", "gpuPercent"),
+)
+_CAMERA_COUNTERS = (
+    ("motionops_frames_read_total", "Frames read (grabbed) from the source.", "framesRead"),
+    ("motionops_frames_decoded_total", "Frames decoded for analysis.", "framesDecoded"),
+    ("motionops_frames_gated_total",
+     "Frames the motion gate kept away from the detector.", "framesGated"),
+    ("motionops_inferences_total", "Frames sent to the detector.", "inferences"),
+    ("motionops_detections_total", "Tracked detections emitted.", "detections"),
+    ("motionops_emits_total", "Events sent to the transport.", "emits"),
+    ("motionops_detection_errors_total", "Frames whose detection or tracking failed.",
+     "detectionErrors"),
+    ("motionops_drops_total", "Frames dropped by the capture buffer and stage queues.", "drops"),
+    ("motionops_reconnects_total", "Source reconnections.", "reconnects"),
+)
+_OUTBOUND_SERIES = (
+    ("motionops_outbound_queued", "gauge", "Events waiting for the sender.", "queued"),
+    ("motionops_outbound_dropped_total", "counter", "Droppable events discarded.", "dropped"),
+    ("motionops_outbound_spooled_total", "counter", "Events written to the disk spool.", "spooled"),
+    ("motionops_outbound_spool_bytes", "gauge", "Size of the disk spool.", "spoolBytes"),
+)
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def render_prometheus(snapshot: dict) -> str:
+    """Prometheus text exposition (format 0.0.4) of a Supervisor.metrics_snapshot()."""
+    lines = []
+
+    def family(name: str, kind: str, help_text: str) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    for name, kind, help_text, key in _PROCESS_SERIES:
+        family(name, kind, help_text)
+        lines.append(f"{name} {snapshot.get(key, 0)}")
+
+    cameras = snapshot.get("cameras", {})
+    family("motionops_camera_fps", "gauge", "Frames analyzed per second.")
+    for camera_id, camera in cameras.items():
+        lines.append(f'motionops_camera_fps{{camera="{_label(camera_id)}"}} {camera["fps"]}')
+
+    family("motionops_stage_latency_seconds", "summary", "Per-stage latency over recent frames.")
+    for camera_id, camera in cameras.items():
+        for stage, latency in camera["latency"].items():
+            labels = f'camera="{_label(camera_id)}",stage="{stage}"'
+            for q in PERCENTILES:
+                lines.append(f'motionops_stage_latency_seconds{{{labels},quantile="{q / 100}"}} '
+                             f'{latency[f"p{q}"] / 1000:.6f}')
+            lines.append(f"motionops_stage_latency_seconds_count{{{labels}}} "
+                         f"{latency.get('count', 0)}")
+
+    for name, help_text, key in _CAMERA_COUNTERS:
+        family(name, "counter", help_text)
+        for camera_id, camera in cameras.items():
+            lines.append(f'{name}{{camera="{_label(camera_id)}"}} {camera["counters"][key]}')
+
+    outbound = snapshot.get("outbound")
+    if outbound:
+        for name, kind, help_text, key in _OUTBOUND_SERIES:
+            family(name, kind, help_text)
+            lines.append(f"{name} {outbound[key]}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,17 @@
+from .base import MotionDetector
+from .factory import available_backends, create_motion_detector, register_motion_detector
+from .gate import MotionGate
+from .stats import MotionStats, analyze_mask
+from .zones import MotionZone, ZoneMask
+
+__all__ = [
+    "MotionDetector",
+    "MotionGate",
+    "MotionStats",
+    "MotionZone",
+    "ZoneMask",
+    "analyze_mask",
+    "available_backends",
+    "create_motion_detector",
+    "register_motion_detector",
+]
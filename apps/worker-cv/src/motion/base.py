@@ -0,0 +1,63 @@
+"""Abstract base class for all motion-detector backends."""
+
+import time
+from abc import ABC, abstractmethod
+
+import cv2
+import numpy as np
+
+# Weight of the newest sample in the per-frame cost moving average
+COST_SMOOTHING = 0.1
+
+
+class MotionDetector(ABC):
+    """Turns consecutive motion frames into a binary (0/255) foreground mask.
+
+    Backends receive the already downscaled motion frame (see Pipeline) and
+    own any thresholding and cleanup they need. detect() times every call so
+    backends can be compared on the same scene.
+    """
+
+    name = "base"
+
+    def __init__(self, sensitivity: float = 0.5):
+        self.sensitivity = sensitivity
+        # Morphology kernel, sized by the pipeline for the motion resolution
+        self.kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+        self.last_cost_ms = 0.0
+        self.mean_cost_ms = 0.0
+
+    def detect(self, frame: np.ndarray) -> np.ndarray:
+        """Return the foreground mask for a frame and record its cost."""
+        start = time.perf_counter()
+        mask = self._apply(frame)
+        self.last_cost_ms = (time.perf_counter() - start) * 1000
+        if self.mean_cost_ms == 0.0:
+            self.mean_cost_ms = self.last_cost_ms
+        else:
+            self.mean_cost_ms += COST_SMOOTHING * (self.last_cost_ms - self.mean_cost_ms)
+        return mask
+
+    @abstractmethod
+    def _apply(self, frame: np.ndarray) -> np.ndarray:
+        """Compute the binary foreground mask for one frame."""
+        ...
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Forget the learned background / reference frame."""
+        ...
+
+    def _clean(self, mask: np.ndarray) -> np.ndarray:
+        """Close small holes, then remove speckle noise."""
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self.kernel)
+        return cv2.morphologyEx(mask, cv2.MORPH_OPEN, self.kernel)
+
+    @staticmethod
+    def _to_gray(frame: np.ndarray) -> np.ndarray:
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+
+    @property
+    def diff_threshold(self) -> int:
+        """Pixel intensity difference counted as motion (25 at sensitivity 0.5, as in V1)."""
+        return max(1, int(50 * (1 - self.sensitivity)))
@@ -0,0 +1,144 @@
+"""Built-in motion-detector backends, from cheapest to most robust."""
+
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from .base import MotionDetector
+
+
+class FrameDiffDetector(MotionDetector):
+    """Blurred absdiff against the previous frame — the V1 approach.
+
+    Cheapest backend; sensitive to global illumination changes.
+    """
+
+    name = "framediff"
+
+    def __init__(self, sensitivity: float = 0.5):
+        super().__init__(sensitivity)
+        self._previous: Optional[np.ndarray] = None
+
+    def _apply(self, frame: np.ndarray) -> np.ndarray:
+        gray = cv2.GaussianBlur(self._to_gray(frame), (5, 5), 0)
+        previous, self._previous = self._previous, gray
+        if previous is None or previous.shape != gray.shape:
+            return np.zeros_like(gray)
+        delta = cv2.absdiff(previous, gray)
+        _, mask = cv2.threshold(delta, self.diff_threshold, 255, cv2.THRESH_BINARY)
+        return self._clean(mask)
+
+    def reset(self) -> None:
+        self._previous = None
+
+
+class RunningAverageDetector(MotionDetector):
+    """absdiff against an exponentially weighted background (accumulateWeighted).
+
+    Tolerates slow lighting drift at the cost of one float accumulator.
+    """
+
+    name = "running_avg"
+
+    def __init__(self, sensitivity: float = 0.5, alpha: float = 0.05):
+        super().__init__(sensitivity)
+        self.alpha = alpha
+        self._background: Optional[np.ndarray] = None
+
+    def _apply(self, frame: np.ndarray) -> np.ndarray:
+        gray = cv2.GaussianBlur(self._to_gray(frame), (5, 5), 0)
+        if self._background is None or self._background.shape != gray.shape:
+            self._background = gray.astype(np.float32)
+            return np.zeros_like(gray)
+        delta = cv2.absdiff(gray, cv2.convertScaleAbs(self._background))
+        cv2.accumulateWeighted(gray, self._background, self.alpha)
+        _, mask = cv2.threshold(delta, self.diff_threshold, 255, cv2.THRESH_BINARY)
+        return self._clean(mask)
+
+    def reset(self) -> None:
+        self._background = None
+
+
+class MOG2Detector(MotionDetector):
+    """Gaussian-mixture background subtraction with shadow removal."""
+
+    name = "mog2"
+
+    def __init__(self, sensitivity: float = 0.5, history: int = 500):
+        super().__init__(sensitivity)
+        self.history = history
+        self.reset()
+
+    def _apply(self, frame: np.ndarray) -> np.ndarray:
+        fg_mask = self._subtractor.apply(frame)
+        # Remove shadows (shadows are marked as 127 in MOG2)
+        _, fg_mask = cv2.threshold(fg_mask, 200, 255, cv2.THRESH_BINARY)
+        return self._clean(fg_mask)
+
+    def reset(self) -> None:
+        self._subtractor = cv2.createBackgroundSubtractorMOG2(
+            history=self.history,
+            varThreshold=int(50 * (1 - self.sensitivity)),
+            detectShadows=True,
+        )
+
+
+class KNNDetector(MotionDetector):
+    """K-nearest-neighbours background subtraction; better on dynamic backgrounds."""
+
+    name = "knn"
+
+    def __init__(self, sensitivity: float = 0.5, history: int = 500):
+        super().__init__(sensitivity)
+        self.history = history
+        self.reset()
+
+    def _apply(self, frame: np.ndarray) -> np.ndarray:
+        fg_mask = self._subtractor.apply(frame)
+        # Shadows are marked as 127, like MOG2
+        _, fg_mask = cv2.threshold(fg_mask, 200, 255, cv2.THRESH_BINARY)
+        return self._clean(fg_mask)
+
+    def reset(self) -> None:
+        self._subtractor = cv2.createBackgroundSubtractorKNN(
+            history=self.history,
+            dist2Threshold=max(50.0, 800.0 * (1 - self.sensitivity)),
+            detectShadows=True,
+        )
+
+
+class BlockDiffDetector(MotionDetector):
+    """Macroblock grid: mean absdiff per block against the previous frame.
+
+    A block is active when its mean difference exceeds the threshold, so the
+    output is a coarse grid mask. Pure NumPy reductions, no morphology.
+    """
+
+    name = "block"
+
+    def __init__(self, sensitivity: float = 0.5, block_size: int = 16):
+        super().__init__(sensitivity)
+        self.block_size = block_size
+        self._previous: Optional[np.ndarray] = None
+
+    def _apply(self, frame: np.ndarray) -> np.ndarray:
+        gray = self._to_gray(frame)
+        previous, self._previous = self._previous, gray
+        mask = np.zeros_like(gray)
+        if previous is None or previous.shape != gray.shape:
+            return mask
+
+        b = self.block_size
+        rows, cols = gray.shape[0] // b, gray.shape[1] // b
+        if rows == 0 or cols == 0:
+            return mask
+        delta = cv2.absdiff(previous[:rows * b, :cols * b], gray[:rows * b, :cols * b])
+        block_mean = delta.reshape(rows, b, cols, b).mean(axis=(1, 3))
+        # Block averages dilute small changes, so use half the per-pixel threshold
+        active = (block_mean > self.diff_threshold / 2).astype(np.uint8) * 255
+        mask[:rows * b, :cols * b] = np.repeat(np.repeat(active, b, axis=0), b, axis=1)
+        return mask
+
+    def reset(self) -> None:
+        self._previous = None
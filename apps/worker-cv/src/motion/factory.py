@@ -0,0 +1,39 @@
+"""Factory for creating motion-detector backends by name."""
+
+import logging
+
+from .base import MotionDetector
+from .detectors import (
+    BlockDiffDetector,
+    FrameDiffDetector,
+    KNNDetector,
+    MOG2Detector,
+    RunningAverageDetector,
+)
+
+logger = logging.getLogger("motionops.motion.factory")
+
+# Backend name → MotionDetector class mapping (extensible)
+_DETECTOR_REGISTRY: dict[str, type[MotionDetector]] = {
+    cls.name: cls
+    for cls in (FrameDiffDetector, RunningAverageDetector, MOG2Detector, KNNDetector,
+                BlockDiffDetector)
+}
+
+
+def register_motion_detector(name: str, detector_class: type[MotionDetector]) -> None:
+    """Register a new motion-detector backend."""
+    _DETECTOR_REGISTRY[name] = detector_class
+    logger.info("Registered motion detector: %s → %s", name, detector_class.__name__)
+
+
+def create_motion_detector(name: str, sensitivity: float = 0.5) -> MotionDetector:
+    """Create the motion-detector backend registered under `name`."""
+    if name not in _DETECTOR_REGISTRY:
+        raise ValueError(
+            f"Unknown motion backend '{name}'. Available: {', '.join(available_backends())}")
+    return _DETECTOR_REGISTRY[name](sensitivity=sensitivity)
+
+
+def available_backends() -> list[str]:
+    return sorted(_DETECTOR_REGISTRY)
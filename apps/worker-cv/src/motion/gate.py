@@ -0,0 +1,79 @@
+"""Motion gate: decides on which frames the detector actually runs."""
+
+import time
+
+
+class MotionGate:
+    """Hysteresis state machine with an inference budget.
+
+    - Becomes active after `activation_frames` consecutive motion frames.
+    - Stays active for at least `min_active_seconds`, and until
+      `release_frames` consecutive frames without motion have been seen.
+    - While active, runs inference on every `infer_every_n`-th frame.
+    - Never exceeds `max_inferences_per_second` (token bucket; 0 = unlimited).
+    """
+
+    def __init__(self, activation_frames: int = 1, release_frames: int = 5,
+                 min_active_seconds: float = 1.0, infer_every_n: int = 1,
+                 max_inferences_per_second: float = 0):
+        self.activation_frames = max(1, activation_frames)
+        self.release_frames = max(1, release_frames)
+        self.min_active_seconds = min_active_seconds
+        self.infer_every_n = max(1, infer_every_n)
+        self.max_inferences_per_second = max_inferences_per_second
+        self.active = False
+        self.skipped_by_budget = 0
+        self._motion_streak = 0
+        self._still_streak = 0
+        self._active_since = 0.0
+        self._active_frames = 0
+        self._tokens = 1.0
+        self._last_refill: float | None = None
+
+    @classmethod
+    def from_settings(cls, settings) -> "MotionGate":
+        return cls(
+            activation_frames=settings.gate_activation_frames,
+            release_frames=settings.gate_release_frames,
+            min_active_seconds=settings.gate_min_active_seconds,
+            infer_every_n=settings.gate_infer_every_n,
+            max_inferences_per_second=settings.gate_max_inferences_per_second,
+        )
+
+    def update(self, motion: bool, now: float | None = None) -> bool:
+        """Feed one frame's motion result. Returns True if inference should run."""
+        now = time.monotonic() if now is None else now
+        if motion:
+            self._motion_streak += 1
+            self._still_streak = 0
+        else:
+            self._still_streak += 1
+            self._motion_streak = 0
+
+        if not self.active and self._motion_streak >= self.activation_frames:
+            self.active = True
+            self._active_since = now
+            self._active_frames = 0
+        elif (self.active and self._still_streak >= self.release_frames
+              and now - self._active_since >= self.min_active_seconds):
+            self.active = False
+
+        if not self.active:
+            return False
+        self._active_frames += 1
+        if (self._active_frames - 1) % self.infer_every_n:
+            return False
+        return self._take_token(now)
+
+    def _take_token(self, now: float) -> bool:
+        if self.max_inferences_per_second <= 0:
+            return True
+        capacity = max(1.0, self.max_inferences_per_second)
+        elapsed = 0.0 if self._last_refill is None else max(0.0, now - self._last_refill)
+        self._tokens = min(capacity, self._tokens + elapsed * self.max_inferences_per_second)
+        self._last_refill = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        self.skipped_by_budget += 1
+        return False
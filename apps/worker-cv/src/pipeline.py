@@ -1,56 +1,207 @@
 """Main video processing pipeline: capture -> detect -> track -> emit events."""
 
 import asyncio
+import contextlib
 import logging
 import time
-from datetime import datetime, timezone
-from uuid import uuid4
+from concurrent.futures import ThreadPoolExecutor
 
 import cv2
 import numpy as np
 
-from .sources.factory import CameraSourceFactory
+from .config import update_setting
+from .inference import (
+    CameraTracker,
+    DetectionBatch,
+    Detector,
+    InferenceScheduler,
+    ModelMetadata,
+    plan_regions,
+    result_to_array,
+)
+from .loop_timing import LoopBlockTimer
+from .metrics import CameraMetrics, PipelineCounters
+from .motion import (
+    MotionDetector,
+    MotionGate,
+    MotionStats,
+    ZoneMask,
+    analyze_mask,
+    create_motion_detector,
+)
+from .profiling import SpanTracer
 from .sources.base import CameraSource
+from .sources.factory import CameraSourceFactory
+from .stages import PIPELINE_STAGES, QUEUED_STAGES, StageQueue, StageStats, default_policy
+from .track_events import TrackEvents
 
 logger = logging.getLogger("motionops.pipeline")
 
+BLOCKED_SMOOTHING = 0.1  # EMA weight of the newest per-frame event-loop blocked time
+# Settings that need a fresh motion detector (and background model) when they change
+MOTION_DETECTOR_FIELDS = (
+    "motion_backend", "motion_sensitivity", "motion_resolution", "motion_grayscale",
+)
 
-class Pipeline:
-    """Orchestrates the video analysis pipeline."""
 
-    def __init__(self, settings, transport):
+class Pipeline:
+    """Orchestrates the video analysis pipeline of a single camera.
+
+    The detector is shared with the other cameras of the worker; motion state,
+    tracking state and settings are owned by this pipeline.
+
+    Frames flow through four concurrent stages — capture, motion, detection,
+    emit — connected by bounded StageQueues whose backpressure policy is set
+    per stage, so throughput is bounded by the slowest stage rather than the
+    sum of all of them. CPU-bound work (motion analysis, tracking) runs on
+    dedicated threads so the event loop stays free for Socket.IO and the
+    other cameras; OpenCV and NumPy release the GIL while they work.
+    """
+
+    def __init__(self, settings, transport, detector: Detector,
+                 scheduler: InferenceScheduler | None = None, camera_id: str | None = None,
+                 tracer: SpanTracer | None = None):
         self.settings = settings
         self.transport = transport
+        self.camera_id = camera_id or settings.camera_source
+        self._detector = detector
+        self._scheduler = scheduler
         self._running = False
         self._source: CameraSource | None = None
-        self._model = None
-        self._bg_subtractor = None
+        self._tracker: CameraTracker | None = None
+        self._motion_detector: MotionDetector | None = None
+        self._zones = ZoneMask(settings.motion_zones)
+        self._gate = MotionGate.from_settings(settings)
+        self._track_events = TrackEvents(
+            self.camera_id,
+            ttl_seconds=settings.event_track_ttl_seconds,
+            max_tracks=settings.event_max_tracks,
+            confidence_step=settings.event_confidence_step,
+        )
+        # (metadata, thresholds) — rebuilt when the model or confidence settings change
+        self._thresholds: tuple[ModelMetadata, np.ndarray] | None = None
+        self._last_motion_state = False
+        self._last_motion_emit = 0.0
+        self._tracks_shown = False  # last worker:track_update had tracks; send one empty to clear
+        self._motion_shape: tuple[int, int] | None = None
+        self._motion_size: tuple[int, int] | None = None
+        self._motion_scale = 1.0
         self._frame_count = 0
-        self._last_health = 0
+        # One thread each for motion and tracking keeps their state updates in frame order
+        self._motion_thread: ThreadPoolExecutor | None = None
+        self._track_thread: ThreadPoolExecutor | None = None
+        self._next_read: asyncio.Task | None = None
+        self._queues: dict[str, StageQueue] = {}
+        self._stats = {name: StageStats() for name in PIPELINE_STAGES}
+        self.metrics = CameraMetrics()
+        self._tracer = tracer or SpanTracer()  # records stage spans only while a profile runs
+        self.counters = PipelineCounters()
+        self._loop_timer = LoopBlockTimer()
+        self._blocked_mark = 0.0
+        self.loop_blocked_ms = 0.0  # smoothed event-loop time held per frame
+        self.last_frame_ms = 0.0
+        self.connect_ms = 0.0
+        self.ready = asyncio.Event()  # set once the first connection attempt finishes
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def motion_backend(self) -> str:
+        return self.settings.motion_backend
+
+    @property
+    def motion_cost_ms(self) -> float:
+        return self._motion_detector.mean_cost_ms if self._motion_detector is not None else 0.0
+
+    @property
+    def inferences_skipped(self) -> int:
+        """Inferences the gate refused because of the per-camera budget."""
+        return self._gate.skipped_by_budget
+
+    @property
+    def dropped_frames(self) -> int:
+        """Frames dropped by the capture buffer and by the stage queues."""
+        dropped = sum(q.dropped for q in self._queues.values())
+        return dropped + (self._source.dropped_frames if self._source is not None else 0)
+
+    @property
+    def queue_size(self) -> int:
+        queued = sum(q.qsize() for q in self._queues.values())
+        return queued + (self._source.queue_size if self._source is not None else 0)
+
+    @property
+    def open_tracks(self) -> int:
+        """Tracks with an event started and not yet ended."""
+        return len(self._track_events)
+
+    @property
+    def fps(self) -> float:
+        """Frames actually analyzed per second (over the last few seconds)."""
+        return self.metrics.fps.rate()
+
+    def counter_stats(self) -> dict:
+        """Cumulative frame, inference, emit, error, drop and reconnect counts, for /metrics."""
+        source = self._source
+        return {
+            "framesRead": source.frames_grabbed if source is not None else 0,
+            "framesDecoded": source.frames_decoded if source is not None else 0,
+            "framesGated": self.counters.frames_gated,
+            "inferences": self.counters.inferences,
+            "detections": self.counters.detections,
+            "emits": self.counters.emits,
+            "detectionErrors": self.counters.detection_errors,
+            "drops": self.dropped_frames,
+            "reconnects": self.counters.reconnects,
+        }
+
+    def stage_stats(self) -> list[dict]:
+        """Per-stage queue depth, drops and service time, for worker:health."""
+        return [
+            {
+                "stage": name,
+                "queueDepth": self._queues[name].qsize() if name in self._queues else 0,
+                "dropped": self._queues[name].dropped if name in self._queues else 0,
+                "serviceMs": round(self._stats[name].service_ms, 2),
+                "processed": self._stats[name].processed,
+            }
+            for name in PIPELINE_STAGES
+        ]
 
     async def run(self) -> None:
         self._running = True
-        logger.info("Initializing pipeline...")
+        logger.info("[%s] Initializing pipeline...", self.camera_id)
 
-        # Initialize components
-        self._init_model()
+        # Initialize per-camera components
         self._init_motion_detector()
 
         # Create and connect camera source via factory
         protocol = self.settings.camera_protocol if self.settings.camera_protocol != "auto" else None
-        self._source = CameraSourceFactory.create(self.settings.camera_source, protocol=protocol)
+        self._source = CameraSourceFactory.create(
+            self.settings.camera_source,
+            protocol=protocol,
+            capture_mode=self.settings.capture_mode,
+            buffer_size=self.settings.capture_buffer_size,
+            analysis_fps=self.settings.analysis_fps,
+            decode_times=self.metrics.histograms["decode"],
+        )
+        connect_start = time.monotonic()
         connected = await self._source.connect()
+        self.connect_ms = (time.monotonic() - connect_start) * 1000
+        self.ready.set()
 
         if not connected:
             logger.error("Failed to open video source: %s", self.settings.camera_source)
             await self.transport.emit_camera_status(
-                camera_id=self.settings.camera_source,
+                camera_id=self.camera_id,
                 status="offline",
                 fps=0,
                 resolution=None,
                 latency_ms=0,
                 error_message="Failed to open source",
             )
+            self._running = False
             return
 
         meta = self._source.metadata
@@ -59,23 +210,91 @@ class Pipeline:
             "Pipeline started — source: %s, protocol: %s, resolution: %s, fps: %s",
             self.settings.camera_source, meta.protocol, resolution, meta.fps,
         )
+        self._motion_thread = ThreadPoolExecutor(max_workers=1,
+                                                 thread_name_prefix=f"motion-{self.camera_id}")
+        self._track_thread = ThreadPoolExecutor(max_workers=1,
+                                                thread_name_prefix=f"track-{self.camera_id}")
+        self._queues = {
+            name: StageQueue(self.settings.stage_queue_size,
+                             self.settings.stage_backpressure.get(name)
+                             or default_policy(name, self._source.lossless))
+            for name in QUEUED_STAGES
+        }
+        # Creating the tracker imports Ultralytics on first use; keep that off the event loop
+        try:
+            await self._offload(self._track_thread, self._init_tracker,
+                                meta.fps or self.settings.camera_fps)
+        except Exception as e:
+            # Without ByteTrack every detection would be dropped: fail the camera loudly
+            logger.error("[%s] Failed to initialize tracker: %s", self.camera_id, e)
+            await self.transport.emit_camera_status(
+                camera_id=self.camera_id,
+                status="offline",
+                fps=0,
+                resolution=resolution,
+                latency_ms=0,
+                error_message=f"Tracker unavailable: {e}",
+            )
+            self._running = False
+            self._motion_thread.shutdown(wait=False)
+            self._track_thread.shutdown(wait=False)
+            await self._source.disconnect()
+            raise
 
         await self.transport.emit_camera_status(
-            camera_id=self.settings.camera_source,
+            camera_id=self.camera_id,
             status="online",
             fps=meta.fps or self.settings.camera_fps,
             resolution=resolution,
             latency_ms=0,
         )
 
+        if self._scheduler is not None:
+            self._scheduler.register()
+        try:
+            await self._loop_timer.run(self._loop(resolution))
+        finally:
+            self._running = False
+            if self._scheduler is not None:
+                self._scheduler.unregister()
+            self._motion_thread.shutdown(wait=False)
+            self._track_thread.shutdown(wait=False)
+            await self._source.disconnect()
+
+    async def _loop(self, resolution: str | None) -> None:
+        """Run the four stages concurrently until the camera stops or a stage fails."""
+        self._next_read = asyncio.create_task(self._source.read_frame())
+        stages = [
+            asyncio.create_task(self._loop_timer.run(stage), name=f"{name}:{self.camera_id}")
+            for name, stage in (
+                ("capture", self._capture_stage(resolution)),
+                ("motion", self._motion_stage()),
+                ("detection", self._detection_stage()),
+                ("emit", self._emit_stage()),
+            )
+        ]
+        try:
+            await asyncio.gather(*stages)
+        finally:
+            for task in stages:
+                task.cancel()
+            # The read runs in a thread on the capture handle; let it finish before disconnect
+            with contextlib.suppress(BaseException):
+                await asyncio.gather(*stages, return_exceptions=True)
+                await self._next_read
+
+    async def _capture_stage(self, resolution: str | None) -> None:
+        """Read frames at the analysis rate and hand them to the motion stage."""
+        queue = self._queues["motion"]
         while self._running:
             frame_start = time.monotonic()
 
-            frame = await self._source.read_frame()
+            frame = await self._next_read
+            self._record_stage("capture", frame_start, self._frame_count + 1)
             if frame is None:
                 logger.warning("Failed to read frame — source may be exhausted or disconnected")
                 await self.transport.emit_camera_status(
-                    camera_id=self.settings.camera_source,
+                    camera_id=self.camera_id,
                     status="offline",
                     fps=0,
                     resolution=resolution,
@@ -83,158 +302,361 @@ class Pipeline:
                     error_message="Frame read failed",
                 )
                 await asyncio.sleep(2)
-                await self._source.connect()  # Try to reconnect
+                if self._running:
+                    self.counters.reconnects += 1
+                    await self._source.connect()  # Try to reconnect
+                self._next_read = asyncio.create_task(self._source.read_frame())
                 continue
 
+            # Capture frame N+1 while frame N moves through the later stages
+            self._next_read = asyncio.create_task(self._source.read_frame())
             self._frame_count += 1
-
-            # Motion detection (MOG2)
-            motion_mask = self._detect_motion(frame)
-            has_motion = self._has_significant_motion(motion_mask)
-
-            # Object detection + tracking (only if motion detected)
-            detections = []
-            if has_motion and self._model is not None:
-                detections = self._detect_and_track(frame)
-
-            # Emit detections
-            if detections:
-                await self.transport.emit_detection(
-                    camera_id=self.settings.camera_source,
-                    frame_number=self._frame_count,
-                    detections=detections,
-                )
-
-                # Generate event candidates for notable detections
-                for det in detections:
-                    if det["confidence"] >= self.settings.detector_confidence:
-                        await self.transport.emit_event_candidate({
-                            "id": str(uuid4()),
-                            "cameraId": self.settings.camera_source,
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
-                            "type": "object_detected",
-                            "severity": "low",
-                            "summary": f"{det['className']} detected (conf: {det['confidence']:.2f})",
-                            "metadata": {
-                                "className": det["className"],
-                                "confidence": det["confidence"],
-                                "trackId": det.get("trackId"),
-                            },
-                            "snapshotPath": None,
-                        })
-
-            # Health heartbeat
-            now = time.monotonic()
-            if now - self._last_health >= self.settings.health_interval_seconds:
-                self._last_health = now
-                frame_time = (now - frame_start) * 1000
-                await self.transport.emit_health(
-                    worker_id=self.settings.worker_id,
-                    status="healthy",
-                    model_loaded=self.settings.model_path,
-                    cpu=0,  # TODO: psutil integration
-                    gpu=0,
-                    ram=0,
-                    inference_latency_ms=frame_time,
-                    active_cameras=1,
-                    dropped_frames=0,
-                    queue_size=0,
-                )
+            self.metrics.fps.tick()
+            await queue.put((self._frame_count, frame, frame_start))
+            self._stats["capture"].record(frame_start)
+            self._record_loop_blocked()
 
             # Frame rate control
             elapsed = time.monotonic() - frame_start
-            target_delay = 1.0 / self.settings.camera_fps
+            target_delay = 1.0 / (self.settings.analysis_fps or self.settings.camera_fps)
             if elapsed < target_delay:
                 await asyncio.sleep(target_delay - elapsed)
-
-    def _init_model(self) -> None:
-        """Load YOLO model."""
+        await queue.close()
+
+    async def _motion_stage(self) -> None:
+        """Motion analysis and gating; frames the gate opens for go on to detection."""
+        inbox, outbox = self._queues["motion"], self._queues["detection"]
+        while (item := await inbox.get()) is not None:
+            frame_number, frame, captured_at = item
+            start = time.monotonic()
+
+            # Motion detection (configured backend, on the downscaled frame)
+            motion = await self._offload(self._motion_thread, self._analyze_frame, frame)
+            self._record_stage("motion", start, frame_number)
+            await self._emit_motion(frame_number, motion)
+            run_inference = self._gate.update(motion.significant)
+
+            regions = None
+            if run_inference and motion.significant and self.settings.roi_inference:
+                regions = plan_regions(
+                    motion.boxes, frame.shape[:2],
+                    padding=self.settings.roi_padding,
+                    min_size=self.settings.roi_min_size,
+                    max_regions=self.settings.roi_max_regions,
+                )
+            self._stats["motion"].record(start)
+
+            # Object detection + tracking (only while the motion gate is open)
+            if run_inference and self._detector.loaded:
+                await outbox.put((frame_number, frame, regions, captured_at))
+            else:
+                self.counters.frames_gated += 1
+                self.last_frame_ms = (time.monotonic() - captured_at) * 1000
+        await outbox.close()
+
+    async def _detection_stage(self) -> None:
+        """YOLO + ByteTrack on gated frames."""
+        inbox, outbox = self._queues["detection"], self._queues["emit"]
+        while (item := await inbox.get()) is not None:
+            frame_number, frame, regions, captured_at = item
+            start = time.monotonic()
+            try:
+                detections = await self._detect_and_track(frame, regions, frame_number)
+            except Exception:
+                # e.g. an inference worker died mid-request (the pool restarts it), or the
+                # detector or tracker choked on one frame: skip it, keep the camera running
+                logger.exception("[%s] Detection failed on frame %d", self.camera_id, frame_number)
+                self.counters.detection_errors += 1
+                detections = DetectionBatch.empty()
+            self._stats["detection"].record(start)
+            await outbox.put((frame_number, detections, frame.shape[:2], captured_at))
+        await outbox.close()
+
+    async def _emit_stage(self) -> None:
+        """Send detections, live track boxes and track event candidates to the backend."""
+        inbox = self._queues["emit"]
+        while True:
+            try:
+                # Wake up without new frames too, so lost tracks get their end event
+                item = await asyncio.wait_for(inbox.get(), self.settings.event_track_ttl_seconds)
+            except asyncio.TimeoutError:
+                await self._emit_events(self._track_events.expire())
+                if self._tracks_shown:  # no gated frames for a while: clear the live overlay
+                    await self.transport.emit_track_update(self.camera_id, [])
+                    self._tracks_shown = False
+                continue
+            if item is None:
+                break
+            frame_number, detections, shape, captured_at = item
+            start = time.monotonic()
+            if len(detections):
+                await self.transport.emit_detection(
+                    camera_id=self.camera_id,
+                    frame_number=frame_number,
+                    detections=self._encode_detections(detections),
+                )
+                self.counters.detections += len(detections)
+                self.counters.emits += 1
+            if len(detections) or self._tracks_shown:
+                await self.transport.emit_track_update(self.camera_id, detections.to_tracks())
+                self._tracks_shown = bool(len(detections))
+                self.counters.emits += 1
+
+            # Event candidates: one per track (start / significant update / end), not per frame
+            thresholds = self._class_thresholds()
+            notable = detections.filter(detections.confidence >= thresholds[detections.class_ids])
+            events = self._track_events.update(notable, self._zones_of(notable, shape))
+            await self._emit_events(events)
+            self._stats["emit"].record(start)
+            self._record_stage("emit", start, frame_number)
+            self._tracer.span(self.camera_id, "frame", captured_at, frame_number)
+            self.last_frame_ms = (time.monotonic() - captured_at) * 1000
+        await self._emit_events(self._track_events.close_all())
+
+    def _encode_detections(self, detections: DetectionBatch) -> list | dict:
+        """worker:detection payload in the configured detection_format."""
+        if self.settings.detection_format == "columnar":
+            return detections.to_columnar()
+        return detections.to_dicts()
+
+    async def _emit_events(self, events: list[dict]) -> None:
+        for event in events:
+            await self.transport.emit_event_candidate(event)
+        self.counters.emits += len(events)
+
+    def _zones_of(self, detections: DetectionBatch,
+                  shape: tuple[int, int]) -> list[frozenset[int]] | None:
+        """Include zones containing each detection's box center."""
+        if not self._zones.active or not len(detections):
+            return None
+        h, w = shape
+        centers = (detections.xyxy[:, :2] + detections.xyxy[:, 2:]) / 2
+        centers /= np.array([w, h], dtype=np.float32)
+        return self._zones.include_zones_at(centers)
+
+    def _record_stage(self, stage: str, start: float, frame_number: int | None) -> None:
+        """Latency histogram sample, plus a trace span while a profile runs."""
+        self.metrics.record_since(stage, start)
+        self._tracer.span(self.camera_id, stage, start, frame_number)
+
+    def _record_loop_blocked(self) -> None:
+        """Event-loop time held by all stages since the previous captured frame."""
+        elapsed = self._loop_timer.elapsed()
+        blocked_ms = (elapsed - self._blocked_mark) * 1000
+        self._blocked_mark = elapsed
+        self.loop_blocked_ms = (blocked_ms if self._frame_count == 1 else
+                                (1 - BLOCKED_SMOOTHING) * self.loop_blocked_ms
+                                + BLOCKED_SMOOTHING * blocked_ms)
+
+    async def apply_config(self, attr: str, value):
+        """Apply a runtime setting to this camera. Returns the previous value.
+
+        State used by the motion or track thread is replaced on that thread,
+        so the change lands between two frames instead of under one.
+        """
+        if attr in MOTION_DETECTOR_FIELDS:
+            return await self._on_stage_thread(self._motion_thread, self._set_motion_detector,
+                                               attr, value)
+        if attr == "motion_zones":
+            return await self._on_stage_thread(self._motion_thread, self._set_motion_zones, value)
+        if attr in ("detector_confidence", "detector_class_confidence"):
+            return await self._on_stage_thread(self._track_thread, self._set_thresholds,
+                                               attr, value)
+        if attr in ("tracking_buffer", "tracking_match_threshold") and self._source is not None:
+            previous = await self._on_stage_thread(self._track_thread, self._set_tracker,
+                                                   attr, value)
+            # The new tracker does not continue the old tracks: end their events now
+            await self._emit_events(self._track_events.close_all())
+            return previous
+
+        previous = update_setting(self.settings, attr, value)
+        if attr.startswith("gate_"):
+            self._gate = MotionGate.from_settings(self.settings)  # only used on the event loop
+        elif attr == "analysis_fps" and self._source is not None:
+            self._source.set_analysis_fps(self.settings.analysis_fps)
+        return previous
+
+    async def _on_stage_thread(self, executor: ThreadPoolExecutor | None, func, *args):
+        """Run a config change on the single thread that owns the state it replaces.
+
+        Before the camera starts, or once its threads are shut down, no frame
+        is in flight and the change is applied directly.
+        """
+        if executor is None:
+            return func(*args)
         try:
-            from ultralytics import YOLO
-            self._model = YOLO(self.settings.model_path)
-            logger.info("YOLO model loaded: %s", self.settings.model_path)
-        except Exception as e:
-            logger.error("Failed to load YOLO model: %s", e)
-            self._model = None
+            future = asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        except RuntimeError:  # executor already shut down
+            return func(*args)
+        return await future
+
+    def _set_motion_detector(self, attr: str, value):
+        """Update a motion setting and start a fresh detector (motion thread)."""
+        previous = update_setting(self.settings, attr, value)
+        self._init_motion_detector()
+        return previous
+
+    def _set_motion_zones(self, value):
+        """Update the zones and drop their cached bitmasks (motion thread)."""
+        previous = update_setting(self.settings, "motion_zones", value)
+        self._zones.set_zones(self.settings.motion_zones)
+        return previous
+
+    def _set_thresholds(self, attr: str, value):
+        """Update a confidence setting; thresholds are rebuilt on next use (track thread)."""
+        previous = update_setting(self.settings, attr, value)
+        self._thresholds = None
+        return previous
+
+    def _set_tracker(self, attr: str, value):
+        """Update a tracking setting and replace the tracker (track thread).
+
+        The setting is only kept when the new tracker could be created.
+        """
+        previous = update_setting(self.settings, attr, value)
+        try:
+            self._init_tracker(self._source.metadata.fps or self.settings.camera_fps)
+        except Exception:
+            update_setting(self.settings, attr, previous)
+            raise
+        return previous
+
+    def _init_tracker(self, frame_rate: float) -> None:
+        """Create this camera's ByteTrack state; the previous one is kept if this raises.
+
+        A replacement tracker continues the previous one's track ids, so the
+        ids of frames still on their way to the emit stage never collide.
+        """
+        first_id = self._tracker.last_id + 1 if self._tracker is not None else 1
+        self._tracker = CameraTracker(self.settings, frame_rate=frame_rate, first_id=first_id)
 
     def _init_motion_detector(self) -> None:
-        """Initialize MOG2 background subtractor."""
-        self._bg_subtractor = cv2.createBackgroundSubtractorMOG2(
-            history=500,
-            varThreshold=int(50 * (1 - self.settings.motion_sensitivity)),
-            detectShadows=True,
+        """Create the configured motion-detector backend."""
+        self._motion_detector = create_motion_detector(
+            self.settings.motion_backend, sensitivity=self.settings.motion_sensitivity,
         )
-        logger.info("MOG2 background subtractor initialized (sensitivity: %.2f)", self.settings.motion_sensitivity)
+        self._motion_shape = None  # recompute the analysis size on the next frame
+        logger.info("[%s] Motion detector initialized: %s (sensitivity: %.2f)",
+                    self.camera_id, self.settings.motion_backend, self.settings.motion_sensitivity)
+
+    def _configure_motion_scale(self, shape: tuple[int, int]) -> None:
+        """Derive the motion-analysis size, scale and kernel for a frame shape."""
+        h, w = shape
+        target = self.settings.motion_resolution
+        self._motion_scale = target / w if 0 < target < w else 1.0
+        self._motion_size = (max(1, round(w * self._motion_scale)),
+                             max(1, round(h * self._motion_scale)))
+        # A 5x5 cleanup kernel on a heavily downscaled mask would erase small objects
+        ksize = 5 if self._motion_scale >= 0.5 else 3
+        if self._motion_shape is not None:
+            # Resolution changed mid-stream: the learned background no longer fits
+            self._init_motion_detector()
+        self._motion_detector.kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (ksize, ksize))
+        self._motion_shape = shape
+        logger.info("[%s] Motion analysis at %dx%d (scale %.3f)",
+                    self.camera_id, *self._motion_size, self._motion_scale)
+
+    def _prepare_motion_frame(self, frame: np.ndarray) -> np.ndarray:
+        """Downscale (and optionally grayscale) the frame used for motion gating.
+
+        The full-resolution frame is left untouched for YOLO and snapshots.
+        """
+        if frame.shape[:2] != self._motion_shape:
+            self._configure_motion_scale(frame.shape[:2])
+        if self._motion_scale < 1.0:
+            frame = cv2.resize(frame, self._motion_size, interpolation=cv2.INTER_AREA)
+        if self.settings.motion_grayscale and frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return frame
 
     def _detect_motion(self, frame: np.ndarray) -> np.ndarray:
-        """Apply MOG2 background subtraction."""
-        fg_mask = self._bg_subtractor.apply(frame)
-        # Remove shadows (shadows are marked as 127 in MOG2)
-        _, fg_mask = cv2.threshold(fg_mask, 200, 255, cv2.THRESH_BINARY)
-        # Morphological cleanup
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_CLOSE, kernel)
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, kernel)
-        return fg_mask
-
-    def _has_significant_motion(self, mask: np.ndarray) -> bool:
-        """Check if motion mask contains significant movement."""
-        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        for contour in contours:
-            if cv2.contourArea(contour) >= self.settings.motion_min_area:
-                return True
-        return False
-
-    def _detect_and_track(self, frame: np.ndarray) -> list[dict]:
-        """Run YOLO detection + ByteTrack tracking."""
-        results = self._model.track(
-            frame,
-            persist=True,
-            conf=self.settings.detector_confidence,
-            iou=self.settings.detector_iou,
-            imgsz=self.settings.inference_size,
-            classes=self._get_class_indices(),
-            verbose=False,
-        )
-
-        detections = []
-        if results and results[0].boxes is not None:
-            boxes = results[0].boxes
-            for i in range(len(boxes)):
-                box = boxes[i]
-                x1, y1, x2, y2 = box.xyxy[0].tolist()
-                conf = float(box.conf[0])
-                cls_id = int(box.cls[0])
-                class_name = self._model.names[cls_id]
-                track_id = int(box.id[0]) if box.id is not None else None
-
-                detections.append({
-                    "id": str(uuid4()),
-                    "className": class_name,
-                    "confidence": round(conf, 3),
-                    "bbox": {
-                        "x": int(x1),
-                        "y": int(y1),
-                        "w": int(x2 - x1),
-                        "h": int(y2 - y1),
-                    },
-                    "trackId": f"track_{track_id}" if track_id is not None else None,
-                })
-
+        """Compute the foreground mask on the downscaled motion frame, restricted to zones."""
+        fg_mask = self._motion_detector.detect(self._prepare_motion_frame(frame))
+        return self._zones.apply(fg_mask)
+
+    def _analyze_motion(self, mask: np.ndarray) -> MotionStats:
+        """Summarize the motion mask; blobs under motion_min_area (full-res pixels) are ignored."""
+        return analyze_mask(mask, self.settings.motion_min_area, self._motion_scale)
+
+    def _analyze_frame(self, frame: np.ndarray) -> MotionStats:
+        """Motion work of the motion stage, run on the motion thread."""
+        return self._analyze_motion(self._detect_motion(frame))
+
+    @staticmethod
+    async def _offload(executor: ThreadPoolExecutor, func, *args):
+        """Run CPU-bound work on one of this camera's threads."""
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+    async def _emit_motion(self, frame_number: int, motion: MotionStats) -> None:
+        """Send worker:motion on each motion start/stop, at most once per interval while active."""
+        now = time.monotonic()
+        changed = motion.significant != self._last_motion_state
+        interval = self.settings.motion_telemetry_interval_seconds
+        due = motion.significant and now - self._last_motion_emit >= interval
+        if not (changed or due):
+            return
+        self._last_motion_state = motion.significant
+        self._last_motion_emit = now
+        await self.transport.emit_motion(self.camera_id, frame_number, motion.to_dict())
+        self.counters.emits += 1
+
+    def _class_thresholds(self) -> np.ndarray:
+        """Per-class-id confidence thresholds for this camera, cached per loaded model."""
+        metadata = self._detector.metadata
+        cached = self._thresholds  # read once: the track thread may reset it meanwhile
+        if cached is None or cached[0] is not metadata:
+            cached = (metadata, metadata.confidence_thresholds(
+                self.settings.detector_confidence, self.settings.detector_class_confidence,
+            ))
+            self._thresholds = cached
+        return cached[1]
+
+    async def _infer(self, images: list[np.ndarray]) -> list:
+        if self._scheduler is not None:
+            return await self._scheduler.submit_many(images, self.settings)
+        return await self._offload(self._track_thread, self._detector.predict,
+                                   images, self.settings)
+
+    async def _detect_and_track(self, frame: np.ndarray, regions: np.ndarray | None = None,
+                                frame_number: int | None = None) -> DetectionBatch:
+        """Run YOLO detection on the shared model + this camera's ByteTrack.
+
+        With regions, only those crops are sent to the model (in one batch) and
+        their boxes are shifted back to frame coordinates before tracking.
+        """
+        start = time.monotonic()
+        if regions is not None and len(regions):
+            crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in regions]
+            results = await self._infer(crops)
+        else:
+            regions = None
+            results = await self._infer([frame])
+        self._record_stage("inference", start, frame_number)
+        self.counters.inferences += 1
+        start = time.monotonic()
+        detections = await self._offload(self._track_thread, self._track, frame, regions, results)
+        self._record_stage("extraction", start, frame_number)
         return detections
 
-    def _get_class_indices(self) -> list[int] | None:
-        """Convert class names to COCO class indices."""
-        if not self._model or not self.settings.detector_classes:
-            return None
-        name_to_id = {v: k for k, v in self._model.names.items()}
-        indices = []
-        for cls_name in self.settings.detector_classes:
-            if cls_name in name_to_id:
-                indices.append(name_to_id[cls_name])
-        return indices if indices else None
+    def _track(self, frame: np.ndarray, regions: np.ndarray | None,
+               results: list) -> DetectionBatch:
+        """Map results to frame coordinates, filter per class, update ByteTrack (track thread)."""
+        if regions is not None:
+            parts = []
+            for (x1, y1, _, _), result in zip(regions, results):
+                dets = result_to_array(result).copy()
+                dets[:, [0, 2]] += x1
+                dets[:, [1, 3]] += y1
+                parts.append(dets)
+            dets = np.concatenate(parts) if parts else np.empty((0, 6), dtype=np.float32)
+        else:
+            dets = result_to_array(results[0] if results else None)
+
+        if self.settings.detector_class_confidence and len(dets):
+            dets = dets[dets[:, 4] >= self._class_thresholds()[dets[:, 5].astype(np.int32)]]
+        tracks = self._tracker.update(dets, frame)
+        return DetectionBatch.from_tracks(tracks, self._detector.class_names)
 
     async def stop(self) -> None:
+        """Ask the frame loop to exit; the source is released when it does."""
         self._running = False
-        if self._source:
-            await self._source.disconnect()
@@ -0,0 +1,182 @@
+"""On-demand profiling: per-frame stage spans as a Chrome trace, plus an optional cProfile dump."""
+
+import asyncio
+import cProfile
+import json
+import logging
+import pstats
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from .metrics import summarize
+
+logger = logging.getLogger("motionops.profiling")
+
+TOP_FUNCTIONS = 15  # cProfile entries included in the summary
+
+
+class SpanTracer:
+    """Collects pipeline stage spans while a profile runs.
+
+    Pipelines call `span` after every stage; while inactive that is a single
+    attribute check, so the tracer can stay wired in permanently. Spans are
+    kept as Chrome trace "complete" events (one lane per camera and stage),
+    which chrome://tracing and Perfetto open directly. At most `max_spans`
+    are kept per session; the rest are counted as truncated.
+    """
+
+    def __init__(self, max_spans: int = 500_000):
+        self.max_spans = max_spans
+        self.active = False
+        self.truncated = 0
+        self._origin = 0.0
+        self._events: list[dict] = []
+        self._lanes: dict[tuple[str, str], int] = {}
+
+    def start(self) -> None:
+        self._events = []
+        self._lanes = {}
+        self.truncated = 0
+        self._origin = time.monotonic()
+        self.active = True
+
+    def stop(self) -> list[dict]:
+        """End the session; returns its trace events (lane names first)."""
+        self.active = False
+        names = [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+             "args": {"name": f"{camera_id} / {stage}"}}
+            for (camera_id, stage), tid in self._lanes.items()
+        ]
+        events, self._events = self._events, []
+        return names + events
+
+    def span(self, camera_id: str, stage: str, start: float,
+             frame_number: int | None = None) -> None:
+        """Record `stage` from the `time.monotonic()` mark `start` until now."""
+        if not self.active:
+            return
+        if len(self._events) >= self.max_spans:
+            self.truncated += 1
+            return
+        end = time.monotonic()
+        lane = self._lanes.setdefault((camera_id, stage), len(self._lanes) + 1)
+        self._events.append({
+            "name": stage,
+            "cat": camera_id,
+            "ph": "X",
+            "ts": round((start - self._origin) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": 1,
+            "tid": lane,
+            "args": {"frame": frame_number},
+        })
+
+
+class Profiler:
+    """Runs one profiling session at a time for the whole worker.
+
+    Usage:
+        profiler = Profiler("profiles", max_seconds=60)
+        pipeline = Pipeline(..., tracer=profiler.tracer)
+        report = await profiler.run(10, cprofile=True)
+
+    cProfile only sees the thread it is enabled on — the event loop, where
+    the stages, scheduler and transport run. Work offloaded to the motion,
+    track and inference threads shows up in the trace spans instead.
+    """
+
+    def __init__(self, output_dir: str = "profiles", max_seconds: float = 60,
+                 max_spans: int = 500_000, name: str = "worker-cv"):
+        self.output_dir = Path(output_dir)
+        self.max_seconds = max_seconds
+        self.name = name
+        self.tracer = SpanTracer(max_spans)
+
+    @property
+    def running(self) -> bool:
+        return self.tracer.active
+
+    async def run(self, seconds: float, cprofile: bool = False) -> dict:
+        """Trace for `seconds` (capped at max_seconds), write the files and return a summary."""
+        if self.tracer.active:
+            raise RuntimeError("A profile is already running")
+        seconds = min(max(float(seconds), 0.1), self.max_seconds)
+        stamp = datetime.now(timezone.utc)
+        profile = cProfile.Profile() if cprofile else None
+        logger.info("Profiling for %.1f s (cProfile: %s)", seconds, cprofile)
+
+        self.tracer.start()
+        if profile is not None:
+            profile.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            if profile is not None:
+                profile.disable()
+            truncated = self.tracer.truncated
+            events = self.tracer.stop()
+
+        loop = asyncio.get_running_loop()
+        report = await loop.run_in_executor(None, self._write, events, profile, stamp)
+        report.update(startedAt=stamp.isoformat(), durationSeconds=seconds,
+                      truncatedSpans=truncated)
+        logger.info("Profile written to %s", report["tracePath"])
+        return report
+
+    def _write(self, events: list[dict], profile: cProfile.Profile | None, stamp: datetime) -> dict:
+        """Write the trace (and cProfile stats) and summarize them; runs off the event loop."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"profile-{self.name}-{stamp.strftime('%Y%m%dT%H%M%SZ')}"
+        trace_path = self.output_dir / f"{stem}.trace.json"
+        with open(trace_path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, separators=(",", ":"))
+
+        report = {
+            "tracePath": str(trace_path),
+            "cprofilePath": None,
+            "spans": sum(1 for e in events if e["ph"] == "X"),
+            "cameras": summarize_spans(events),
+            "topFunctions": [],
+        }
+        if profile is not None:
+            prof_path = self.output_dir / f"{stem}.prof"
+            profile.dump_stats(prof_path)
+            report["cprofilePath"] = str(prof_path)
+            report["topFunctions"] = top_functions(profile)
+        return report
+
+
+def summarize_spans(events: list[dict]) -> dict:
+    """Per camera and stage: span count, total time and p50/p95/p99 in ms."""
+    durations: dict[str, dict[str, list[float]]] = {}
+    for event in events:
+        if event["ph"] == "X":
+            stages = durations.setdefault(event["cat"], {})
+            stages.setdefault(event["name"], []).append(event["dur"] / 1000)
+    return {
+        camera_id: {
+            stage: {"count": len(values), "totalMs": round(sum(values), 1),
+                    **summarize(np.array(values))}
+            for stage, values in stages.items()
+        }
+        for camera_id, stages in durations.items()
+    }
+
+
+def top_functions(profile: cProfile.Profile, limit: int = TOP_FUNCTIONS) -> list[dict]:
+    """The functions with the most cumulative time."""
+    stats = pstats.Stats(profile).stats
+    ranked = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return [
+        {
+            "function": f"{Path(filename).name}:{line}({func})",
+            "calls": calls,
+            "ownMs": round(own * 1000, 2),
+            "cumulativeMs": round(cumulative * 1000, 2),
+        }
+        for (filename, line, func), (_, calls, own, cumulative, _) in ranked
+    ]
@@ -1,5 +1,5 @@
-from .base import CameraSource
+from .base import CameraSource, redact_url
 from .factory import CameraSourceFactory
 from .opencv_source import OpenCVSource
 
-__all__ = ["CameraSource", "CameraSourceFactory", "OpenCVSource"]
+__all__ = ["CameraSource", "CameraSourceFactory", "OpenCVSource", "redact_url"]
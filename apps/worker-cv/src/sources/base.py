@@ -3,10 +3,19 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Optional
+from urllib.parse import urlsplit, urlunsplit
 
 import numpy as np
 
 
+def redact_url(source_url: str) -> str:
+    """The source URL without user:password, safe to expose (e.g. rtsp://host:554/stream)."""
+    parts = urlsplit(source_url)
+    if not parts.netloc or "@" not in parts.netloc:
+        return source_url
+    return urlunsplit(parts._replace(netloc=parts.netloc.rsplit("@", 1)[1]))
+
+
 @dataclass
 class SourceMetadata:
     """Metadata about the connected camera source."""
@@ -20,6 +29,10 @@ class SourceMetadata:
 class CameraSource(ABC):
     """Abstract camera source that all protocol adapters must implement."""
 
+    # Cumulative frame counts; adapters that can tell them apart update both
+    frames_grabbed: int = 0
+    frames_decoded: int = 0
+
     @abstractmethod
     async def connect(self) -> bool:
         """Establish connection to the source. Returns True on success."""
@@ -45,3 +58,25 @@ class CameraSource(ABC):
     def metadata(self) -> SourceMetadata:
         """Return current source metadata."""
         ...
+
+    def set_analysis_fps(self, fps: float) -> None:
+        """Limit how many frames per second are decoded for analysis (0 = all).
+
+        Sources that cannot skip decoding ignore this; the pipeline still paces
+        itself to the analysis rate.
+        """
+
+    @property
+    def lossless(self) -> bool:
+        """Every captured frame is delivered (e.g. files), so later stages should not drop any."""
+        return False
+
+    @property
+    def dropped_frames(self) -> int:
+        """Frames captured but never delivered to the pipeline (cumulative)."""
+        return 0
+
+    @property
+    def queue_size(self) -> int:
+        """Frames currently buffered between capture and the pipeline."""
+        return 0
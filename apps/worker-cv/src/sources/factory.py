@@ -33,12 +33,14 @@ class CameraSourceFactory:
     """
 
     @staticmethod
-    def create(source_url: str, protocol: Optional[str] = None) -> CameraSource:
+    def create(source_url: str, protocol: Optional[str] = None, **options) -> CameraSource:
         """Create a CameraSource for the given URL.
 
         Args:
             source_url: The camera URL or identifier.
             protocol: Optional explicit protocol override. If not given, auto-detected.
+            options: Capture options for the OpenCV fallback
+                (capture_mode, buffer_size, analysis_fps, decode_times).
         """
         # Detect protocol from URL
         if protocol is None:
@@ -51,7 +53,7 @@ class CameraSourceFactory:
 
         # Fallback to OpenCV (handles most protocols)
         logger.info("Using OpenCV adapter for source: %s (protocol=%s)", source_url, protocol)
-        return OpenCVSource(source_url)
+        return OpenCVSource(source_url, **options)
 
     @staticmethod
     def _detect_protocol(source_url: str) -> str:
@@ -0,0 +1,74 @@
+"""Bounded frame buffer shared between a capture thread and the pipeline."""
+
+import threading
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+LATEST = "latest"  # live sources: keep only what is fresh, drop the rest
+LOSSLESS = "lossless"  # files: never drop, the reader waits for the pipeline
+
+
+class FrameBuffer:
+    """Fixed-size, thread-safe ring buffer of decoded frames.
+
+    With the "latest" policy the writer never blocks: when the buffer is full
+    the oldest frame is overwritten, and a reader always receives the newest
+    frame, discarding anything older. Both cases are counted in `dropped`.
+    With the "lossless" policy the writer blocks until space is available and
+    frames are delivered in order.
+    """
+
+    def __init__(self, capacity: int = 4, policy: str = LATEST):
+        if policy not in (LATEST, LOSSLESS):
+            raise ValueError(f"Unknown frame buffer policy: {policy}")
+        self.capacity = max(1, capacity)
+        self.policy = policy
+        self.dropped = 0
+        self._frames: deque[np.ndarray] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def put(self, frame: np.ndarray) -> bool:
+        """Add a frame. Returns False if the buffer was closed."""
+        with self._cond:
+            if self.policy == LOSSLESS:
+                self._cond.wait_for(lambda: self._closed or len(self._frames) < self.capacity)
+            elif len(self._frames) >= self.capacity:
+                self._frames.popleft()
+                self.dropped += 1
+            if self._closed:
+                return False
+            self._frames.append(frame)
+            self._cond.notify_all()
+            return True
+
+    def get(self, timeout: float | None = None) -> Optional[np.ndarray]:
+        """Wait for a frame. Returns None on timeout or once closed and drained."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._frames or self._closed, timeout):
+                return None
+            if not self._frames:
+                return None
+            if self.policy == LATEST:
+                self.dropped += len(self._frames) - 1
+                frame = self._frames.pop()
+                self._frames.clear()
+            else:
+                frame = self._frames.popleft()
+            self._cond.notify_all()
+            return frame
+
+    def close(self) -> None:
+        """Wake every waiter; subsequent puts are rejected."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
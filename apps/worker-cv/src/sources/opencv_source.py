@@ -2,12 +2,15 @@
 
 import asyncio
 import logging
+import threading
+import time
 from typing import Optional
 
 import cv2
 import numpy as np
 
 from .base import CameraSource, SourceMetadata
+from .frame_buffer import LATEST, LOSSLESS, FrameBuffer
 
 logger = logging.getLogger("motionops.sources.opencv")
 
@@ -21,12 +24,38 @@ class OpenCVSource(CameraSource):
     - File: source_url = "/path/to/video.mp4"
     - MJPEG: source_url = "http://ip:8080/video"
     - HLS: source_url = "http://ip/stream.m3u8" (requires FFmpeg backend)
+
+    Capture modes:
+    - "direct": read_frame() reads from VideoCapture on demand
+    - "latest": a reader thread drains the source continuously and
+      read_frame() returns the newest frame, dropping stale ones
+    - "lossless": a reader thread prefetches frames in order without dropping
+    - "auto": "latest" for live sources, "lossless" for files
+
+    With an analysis rate set (set_analysis_fps), frames in between analyzed
+    ones are only grab()bed; retrieve() — the decode — runs for analyzed frames.
+    Its duration is recorded in `decode_times` when given (any object with
+    `record(ms)`, e.g. a RollingHistogram).
     """
 
-    def __init__(self, source_url: str):
+    READ_TIMEOUT_SECONDS = 5
+
+    def __init__(self, source_url: str, capture_mode: str = "direct", buffer_size: int = 4,
+                 analysis_fps: float = 0, decode_times=None):
         self._source_url = source_url
         self._cap: Optional[cv2.VideoCapture] = None
         self._metadata = SourceMetadata(protocol=self._detect_protocol())
+        self._capture_mode = capture_mode
+        self._buffer_size = buffer_size
+        self._buffer: Optional[FrameBuffer] = None
+        self._reader: Optional[threading.Thread] = None
+        self._dropped_total = 0
+        self._analysis_fps = analysis_fps
+        self._decode_credit = 1.0
+        self._last_decode = 0.0
+        self.frames_grabbed = 0
+        self.frames_decoded = 0
+        self.decode_times = decode_times
 
     def _detect_protocol(self) -> str:
         url = self._source_url.lower()
@@ -47,10 +76,10 @@ class OpenCVSource(CameraSource):
 
     async def connect(self) -> bool:
         """Open the video source."""
-        if self._cap is not None:
-            self._cap.release()
-
         loop = asyncio.get_event_loop()
+        stopped = await loop.run_in_executor(None, self._stop_reader)
+        self._release_capture(stopped)
+
         self._cap = await loop.run_in_executor(None, self._open_capture)
 
         if self._cap is None or not self._cap.isOpened():
@@ -71,6 +100,7 @@ class OpenCVSource(CameraSource):
             "Source connected: %s (protocol=%s, resolution=%s, fps=%s)",
             self._source_url, self._metadata.protocol, self._metadata.resolution, self._metadata.fps,
         )
+        self._start_reader()
         return True
 
     def _open_capture(self) -> Optional[cv2.VideoCapture]:
@@ -85,13 +115,130 @@ class OpenCVSource(CameraSource):
         if self._cap is None or not self._cap.isOpened():
             return None
         loop = asyncio.get_event_loop()
-        ret, frame = await loop.run_in_executor(None, self._cap.read)
-        return frame if ret else None
+        if self._buffer is not None:
+            return await loop.run_in_executor(None, self._buffer.get, self.READ_TIMEOUT_SECONDS)
+        return await loop.run_in_executor(None, self._read_next, self._cap, None)
+
+    def set_analysis_fps(self, fps: float) -> None:
+        self._analysis_fps = max(0.0, fps)
+        self._decode_credit = 1.0
+
+    def _should_decode(self) -> bool:
+        """Decide whether the frame just grabbed will be analyzed."""
+        if self._analysis_fps <= 0:
+            return True
+        source_fps = self._metadata.fps
+        if source_fps:
+            # Frame-count decimation: exact for files, stable for live streams
+            self._decode_credit += self._analysis_fps / source_fps
+            if self._decode_credit >= 1.0:
+                self._decode_credit -= 1.0
+                return True
+            return False
+        now = time.monotonic()
+        if now - self._last_decode >= 1.0 / self._analysis_fps:
+            self._last_decode = now
+            return True
+        return False
+
+    def _read_next(self, cap: cv2.VideoCapture,
+                   buffer: Optional[FrameBuffer]) -> Optional[np.ndarray]:
+        """Return the next frame to analyze, grabbing without decoding the ones skipped."""
+        while buffer is None or not buffer.closed:
+            if not cap.grab():
+                return None
+            self.frames_grabbed += 1
+            if self._should_decode():
+                start = time.monotonic()
+                ret, frame = cap.retrieve()
+                if not ret:
+                    return None
+                self.frames_decoded += 1
+                if self.decode_times is not None:
+                    self.decode_times.record((time.monotonic() - start) * 1000)
+                return frame
+        return None
+
+    def _resolve_policy(self) -> Optional[str]:
+        if self._capture_mode == "auto":
+            return LATEST if self._metadata.is_live else LOSSLESS
+        if self._capture_mode in (LATEST, LOSSLESS):
+            return self._capture_mode
+        return None
+
+    def _start_reader(self) -> None:
+        policy = self._resolve_policy()
+        if policy is None:
+            return
+        self._buffer = FrameBuffer(capacity=self._buffer_size, policy=policy)
+        self._reader = threading.Thread(
+            target=self._reader_loop,
+            args=(self._cap, self._buffer),
+            name=f"capture:{self._source_url}",
+            daemon=True,
+        )
+        self._reader.start()
+        logger.info("Capture thread started: %s (policy=%s, buffer=%d)",
+                    self._source_url, policy, self._buffer.capacity)
+
+    def _reader_loop(self, cap: cv2.VideoCapture, buffer: FrameBuffer) -> None:
+        """Continuously pull frames so the decoder's internal queue never backs up."""
+        while not buffer.closed:
+            frame = self._read_next(cap, buffer)
+            if frame is None or not buffer.put(frame):
+                break
+        buffer.close()
+
+    def _stop_reader(self) -> bool:
+        """Stop the capture thread; False if it is still running (stuck in grab)."""
+        stopped = True
+        if self._buffer is not None:
+            self._buffer.close()
+            self._dropped_total += self._buffer.dropped
+        if self._reader is not None:
+            self._reader.join(timeout=self.READ_TIMEOUT_SECONDS)
+            if self._reader.is_alive():
+                logger.warning("Capture thread did not exit in time: %s", self._source_url)
+                stopped = False
+        self._buffer = None
+        self._reader = None
+        return stopped
+
+    def _release_capture(self, reader_stopped: bool) -> None:
+        """Release the VideoCapture, unless a capture thread may still be using it.
+
+        Releasing a capture another thread is grabbing from is undefined
+        behaviour in OpenCV. A stuck reader keeps its own reference; the
+        capture is released by its destructor once that thread exits.
+        """
+        if self._cap is None:
+            return
+        if reader_stopped:
+            self._cap.release()
+        else:
+            logger.warning("Leaving the capture of %s to its exiting thread", self._source_url)
+        self._cap = None
+
+    @property
+    def lossless(self) -> bool:
+        """Files read in lossless or direct mode; live sources and "latest" may skip frames."""
+        return not self._metadata.is_live and self._resolve_policy() != LATEST
+
+    @property
+    def dropped_frames(self) -> int:
+        return self._dropped_total + (self._buffer.dropped if self._buffer is not None else 0)
+
+    @property
+    def queue_size(self) -> int:
+        return len(self._buffer) if self._buffer is not None else 0
 
     async def disconnect(self) -> None:
+        stopped = True
+        if self._buffer is not None:
+            loop = asyncio.get_event_loop()
+            stopped = await loop.run_in_executor(None, self._stop_reader)
         if self._cap is not None:
-            self._cap.release()
-            self._cap = None
+            self._release_capture(stopped)
             logger.info("Source disconnected: %s", self._source_url)
 
     def is_connected(self) -> bool:
@@ -0,0 +1,111 @@
+"""Size-capped append-only spool for outbound events the backend has not received yet."""
+
+import json
+import logging
+from pathlib import Path
+
+logger = logging.getLogger("motionops.spool")
+
+
+class Spool:
+    """JSON-lines file of {"event", "data"} records, replayed in order.
+
+    Records are appended until the file reaches `max_bytes`; later ones are
+    dropped (and counted). Reading is two-step — `read` then `commit` — so a
+    replay interrupted by a disconnect resumes where it stopped. Records left
+    by a previous run are replayed too.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.dropped = 0
+        self.spooled = 0
+        self._file = None
+        self._read_pos = 0
+        self._size = self.path.stat().st_size if self.path.exists() else 0
+
+    @property
+    def pending(self) -> bool:
+        return self._size > self._read_pos
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def append(self, event: str, data: dict) -> bool:
+        """Spool one event. Returns False if it was dropped (cap reached or not JSON-safe)."""
+        try:
+            record = json.dumps({"event": event, "data": data}, separators=(",", ":"))
+            line = (record + "\n").encode()
+        except (TypeError, ValueError) as e:
+            logger.warning("Cannot spool %s: %s", event, e)
+            self.dropped += 1
+            return False
+        if self._size + len(line) > self.max_bytes:
+            self.dropped += 1
+            return False
+        self._write(line)
+        self.spooled += 1
+        return True
+
+    def prepend(self, records: list[dict]) -> None:
+        """Put {"event", "data"} records ahead of the pending ones (rewrites the file).
+
+        For events that were queued in memory before the pending records were
+        spooled, so replay keeps the order they were emitted in.
+        """
+        if not records:
+            return
+        pending = b""
+        if self.pending:
+            with open(self.path, "rb") as f:
+                f.seek(self._read_pos)
+                pending = f.read()
+        self.clear()
+        for record in records:
+            self.append(record["event"], record["data"])
+        if pending:
+            self._write(pending)  # already accepted once; kept even past max_bytes
+
+    def _write(self, data: bytes) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "ab")
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+
+    def read(self, limit: int) -> tuple[list[dict], int]:
+        """Up to `limit` records from the replay position, and the position after them."""
+        records = []
+        with open(self.path, "rb") as f:
+            f.seek(self._read_pos)
+            while len(records) < limit:
+                line = f.readline()
+                if not line:
+                    break
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning("Skipping corrupt spool record at byte %d", f.tell() - len(line))
+            return records, f.tell()
+
+    def commit(self, position: int) -> None:
+        """Mark records up to `position` as delivered; empties the file once all are."""
+        self._read_pos = position
+        if self._read_pos >= self._size:
+            self.clear()
+
+    def clear(self) -> None:
+        if self._file is not None:
+            self._file.seek(0)
+            self._file.truncate()
+        elif self.path.exists():
+            self.path.write_bytes(b"")
+        self._size = self._read_pos = 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
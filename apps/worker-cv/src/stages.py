@@ -0,0 +1,90 @@
+"""Bounded queues and service-time stats for the staged frame pipeline."""
+
+import asyncio
+import time
+from dataclasses import dataclass
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+BACKPRESSURE_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+# Stages that consume from a queue, in pipeline order (capture only produces)
+PIPELINE_STAGES = ("capture", "motion", "detection", "emit")
+QUEUED_STAGES = PIPELINE_STAGES[1:]
+
+SERVICE_SMOOTHING = 0.1  # EMA weight of the newest service-time sample
+
+_CLOSED = object()
+
+
+def default_policy(stage: str, lossless: bool) -> str:
+    """Backpressure of a stage with no configured policy.
+
+    Emit always blocks (its events must not be lost). The other stages drop
+    the oldest frame on live sources, so analysis stays current, and block on
+    lossless ones, where every frame is meant to be analyzed.
+    """
+    return BLOCK if lossless or stage == "emit" else DROP_OLDEST
+
+
+class StageQueue:
+    """Bounded asyncio queue between two pipeline stages.
+
+    When full, `put` applies the backpressure policy:
+    - drop_oldest: discard the oldest waiting item (freshest data wins)
+    - drop_newest: discard the incoming item
+    - block: wait until the consumer makes room (nothing is lost)
+
+    `close` always gets through, so the consumer sees the end of the stream;
+    on a full dropping queue it displaces the oldest item.
+    """
+
+    def __init__(self, maxsize: int = 2, policy: str = DROP_OLDEST):
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy '{policy}'")
+        self.policy = policy
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, maxsize))
+        self.dropped = 0
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    async def put(self, item) -> None:
+        if self.policy == BLOCK:
+            await self._queue.put(item)
+            return
+        if self._queue.full():
+            self.dropped += 1
+            if self.policy == DROP_NEWEST:
+                return
+            self._queue.get_nowait()
+        self._queue.put_nowait(item)
+
+    async def get(self):
+        """Next item, or None once the queue has been closed and drained."""
+        item = await self._queue.get()
+        return None if item is _CLOSED else item
+
+    async def close(self) -> None:
+        if self.policy == BLOCK:
+            await self._queue.put(_CLOSED)
+            return
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(_CLOSED)
+
+
+@dataclass
+class StageStats:
+    """Smoothed time a stage spends on one item, excluding queue waits."""
+    processed: int = 0
+    service_ms: float = 0.0
+
+    def record(self, start: float) -> None:
+        elapsed_ms = (time.monotonic() - start) * 1000
+        self.processed += 1
+        self.service_ms = (elapsed_ms if self.processed == 1 else
+                           (1 - SERVICE_SMOOTHING) * self.service_ms
+                           + SERVICE_SMOOTHING * elapsed_ms)
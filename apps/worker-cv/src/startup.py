@@ -0,0 +1,40 @@
+"""Startup-phase timing for worker cold starts."""
+
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """Records how long each startup phase takes, from process entry to ready.
+
+    Usage:
+        profiler = StartupProfiler()
+        with profiler.phase("settings"):
+            settings = Settings()
+        profiler.record("model_load", detector.load_timings["load"])
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = (time.perf_counter() - start) * 1000
+
+    def record(self, name: str, duration_ms: float) -> None:
+        self.phases[name] = duration_ms
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def report(self) -> dict:
+        return {
+            "phases": {name: round(ms, 1) for name, ms in self.phases.items()},
+            "totalMs": round(self.elapsed_ms, 1),
+        }
@@ -0,0 +1,384 @@
+"""Multi-camera supervisor: one worker process serving N camera pipelines."""
+
+import asyncio
+import logging
+import time
+
+import numpy as np
+
+from .config import Settings, camera_settings, resolve_runtime_field, update_setting
+from .inference import Detector, InferencePool, InferenceScheduler
+from .metrics import ProcessMetrics, summarize
+from .pipeline import Pipeline
+from .profiling import Profiler
+from .sources import redact_url
+from .startup import StartupProfiler
+
+logger = logging.getLogger("motionops.supervisor")
+
+STOP_TIMEOUT_SECONDS = 5
+STARTUP_CONNECT_TIMEOUT_SECONDS = 30
+
+
+class Supervisor:
+    """Runs one Pipeline per camera on a shared detector and transport.
+
+    Cameras listed in Settings (camera_source + camera_sources) are started at
+    boot; others are added and removed at runtime via `worker:start` and
+    `worker:stop`. Worker-level health is emitted here rather than per camera.
+    """
+
+    def __init__(self, settings: Settings, transport, startup: StartupProfiler | None = None):
+        self.settings = settings
+        self.startup = startup or StartupProfiler()
+        self.process_metrics = ProcessMetrics()
+        self.profiler = Profiler(settings.profile_dir, max_seconds=settings.profile_max_seconds,
+                                 max_spans=settings.profile_max_spans, name=settings.worker_id)
+        self.transport = transport
+        self.detector = Detector.from_settings(settings)
+        # With a pool the model lives in worker processes; self.detector only keeps its metadata
+        self.pool = (InferencePool.from_settings(settings)
+                     if settings.inference_workers != 0 else None)
+        self.scheduler = InferenceScheduler(
+            self.detector,
+            max_batch=settings.inference_batch_size,
+            deadline_ms=settings.inference_batch_deadline_ms,
+            pool=self.pool,
+        )
+        self._pipelines: dict[str, Pipeline] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._running = False
+        self._reload_lock = asyncio.Lock()
+        self.last_swap_ms = 0.0
+
+        transport.on_camera_start(self._on_camera_start)
+        transport.on_camera_stop(self._on_camera_stop)
+        transport.on_config_update(self._on_config_update)
+        transport.on_model_reload(self._on_model_reload)
+        transport.on_profile(self._on_profile)
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def active_cameras(self) -> int:
+        return sum(1 for p in self._pipelines.values() if p.running)
+
+    async def run(self) -> None:
+        self._running = True
+
+        # Cameras connect while the model loads; they only run motion until it is ready
+        for source in [self.settings.camera_source, *self.settings.camera_sources]:
+            if source:
+                await self.start_camera(source)
+        await self._load_model()
+        await self._emit_startup_report()
+
+        await self._health_loop()
+
+    async def _load_model(self) -> None:
+        """Load and warm up the shared model off the event loop, recording each phase."""
+        if self.pool is not None:
+            # Workers spawn, load and warm up in parallel; step timings are those of the first one
+            with self.startup.phase("model"):
+                result = await self.pool.start(self.settings)
+            for step, ms in result.timings.items():
+                self.startup.record(f"model_{step}", ms)
+            self._record_warmup(result.warmup_ms)
+            # What the worker did not time itself: process spawn and its imports
+            worker_ms = sum(result.timings.values()) + sum(result.warmup_ms)
+            self.startup.record("pool_spawn", max(0.0, self.startup.phases["model"] - worker_ms))
+            if result.ok:
+                self.detector.attach(result.names, self.settings.model_path, result.backend)
+            return
+
+        # Like a reload: the cameras already running only see the model once it is
+        # warm, and never while warm-up is still using it from another thread
+        candidate = Detector.from_settings(self.settings)
+        loop = asyncio.get_running_loop()
+        with self.startup.phase("model"):
+            loaded = await loop.run_in_executor(None, candidate.load)
+        for step, ms in candidate.load_timings.items():
+            self.startup.record(f"model_{step}", ms)
+        if not loaded:
+            return
+
+        if self.settings.warmup_runs > 0:
+            with self.startup.phase("warmup"):
+                durations = await loop.run_in_executor(
+                    None, candidate.warm_up, self.settings, self.settings.warmup_runs,
+                )
+            self._record_warmup(durations)
+        self.detector.swap(candidate)
+
+    def _record_warmup(self, durations: list[float]) -> None:
+        """Startup phases for the warm-up runs (total, cold first run, warm last run)."""
+        if not durations:
+            return
+        self.startup.phases.setdefault("warmup", sum(durations))
+        self.startup.record("warmup_first_run", durations[0])
+        self.startup.record("warmup_last_run", durations[-1])
+        logger.info("Model warm-up: %d runs, first %.0f ms, last %.0f ms",
+                    len(durations), durations[0], durations[-1])
+
+    async def _emit_startup_report(self) -> None:
+        """Emit worker:startup once, after the boot cameras attempted to connect."""
+        pipelines = list(self._pipelines.values())
+        if pipelines:
+            await asyncio.wait([asyncio.create_task(p.ready.wait()) for p in pipelines],
+                               timeout=STARTUP_CONNECT_TIMEOUT_SECONDS)
+        for p in pipelines:
+            if p.ready.is_set():
+                self.startup.record(f"connect:{p.camera_id}", p.connect_ms)
+        report = self.startup.report()
+        logger.info("Startup complete in %.0f ms: %s", report["totalMs"], report["phases"])
+        await self.transport.emit_startup(self.settings.worker_id, report)
+
+    async def start_camera(self, camera_id: str, source_url: str | None = None,
+                           overrides: dict | None = None) -> bool:
+        """Start a pipeline for a camera. Returns False if it could not be started."""
+        if camera_id in self._pipelines:
+            logger.info("Camera already running: %s", camera_id)
+            return True
+        if len(self._pipelines) >= self.settings.max_cameras:
+            logger.error("Camera limit reached (%d), refusing %s",
+                         self.settings.max_cameras, camera_id)
+            return False
+
+        try:
+            settings = camera_settings(self.settings, source_url or camera_id, overrides)
+        except ValueError as e:
+            logger.error("Invalid settings for camera %s: %s", camera_id, e)
+            return False
+
+        pipeline = Pipeline(settings=settings, transport=self.transport,
+                            detector=self.detector, scheduler=self.scheduler,
+                            camera_id=camera_id, tracer=self.profiler.tracer)
+        self._pipelines[camera_id] = pipeline
+        task = asyncio.create_task(pipeline.run(), name=f"pipeline:{camera_id}")
+        task.add_done_callback(lambda t, cid=camera_id: self._on_pipeline_done(cid, t))
+        self._tasks[camera_id] = task
+        logger.info("Camera started: %s (%d active)", camera_id, len(self._pipelines))
+        return True
+
+    async def stop_camera(self, camera_id: str) -> None:
+        pipeline = self._pipelines.get(camera_id)
+        task = self._tasks.get(camera_id)
+        if pipeline is None or task is None:
+            logger.info("Camera not running: %s", camera_id)
+            return
+
+        await pipeline.stop()
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout=STOP_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning("Pipeline %s did not stop in time, cancelling", camera_id)
+            task.cancel()
+        except Exception:
+            pass  # already logged by _on_pipeline_done
+
+    async def reload_model(self, model_path: str | None = None) -> None:
+        """Load a model in the background and swap it in between frames.
+
+        The current model keeps serving every camera while the new one loads and
+        warms up in an executor thread (or in each pool worker in turn); motion
+        backgrounds and ByteTrack state are untouched by the swap.
+        """
+        if self._reload_lock.locked():
+            raise RuntimeError("A model reload is already in progress")
+        async with self._reload_lock:
+            start = time.monotonic()
+            model_path = model_path or self.settings.model_path
+            settings = camera_settings(self.settings, self.settings.camera_source,
+                                       {"model_path": model_path})
+            if self.pool is not None:
+                result = await self.pool.reload(settings)
+                if not result.ok:
+                    raise RuntimeError(result.error)
+                self.detector.attach(result.names, model_path, result.backend)
+            else:
+                await self._swap_local_model(settings)
+            self.settings.model_path = model_path
+            self.last_swap_ms = (time.monotonic() - start) * 1000
+            logger.info("Model swapped to %s (version %d) in %.0f ms",
+                        model_path, self.detector.version, self.last_swap_ms)
+
+    async def _swap_local_model(self, settings: Settings) -> None:
+        """Load and warm up a candidate in an executor thread, then swap it in."""
+        candidate = Detector.from_settings(settings)
+        loop = asyncio.get_running_loop()
+        if not await loop.run_in_executor(None, candidate.load):
+            raise RuntimeError(f"Failed to load model {settings.model_path}")
+        await loop.run_in_executor(None, candidate.warm_up, settings)
+        self.detector.swap(candidate)
+
+    async def profile(self, seconds: float, cprofile: bool = False) -> dict:
+        """Trace every camera's stages for `seconds` and report the summary to the backend.
+
+        Raises RuntimeError if a profile is already running.
+        """
+        report = await self.profiler.run(seconds, cprofile=cprofile)
+        await self.transport.emit_profile_report(self.settings.worker_id, success=True,
+                                                 report=report)
+        return report
+
+    async def stop(self) -> None:
+        self._running = False
+        await asyncio.gather(*(self.stop_camera(cid) for cid in list(self._pipelines)))
+        if self.pool is not None:
+            await self.pool.close()
+
+    def _on_pipeline_done(self, camera_id: str, task: asyncio.Task) -> None:
+        self._pipelines.pop(camera_id, None)
+        self._tasks.pop(camera_id, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Pipeline %s crashed: %s", camera_id, task.exception())
+        logger.info("Camera stopped: %s (%d active)", camera_id, len(self._pipelines))
+
+    def metrics_snapshot(self) -> dict:
+        """Process resources, outbound queue, and per-camera fps, latency percentiles and counters.
+
+        Cameras are keyed by their id with any URL credentials removed.
+
+        Only reads counters, copies histogram rings and reuses the health loop's
+        last process sample, so the HTTP server may call it from its own threads
+        while the cameras run.
+        """
+        pipelines = list(self._pipelines.values())
+        inference = [p.metrics.histograms["inference"].samples() for p in pipelines]
+        return {
+            **self.process_metrics.last,
+            "uptimeSeconds": round(self.process_metrics.uptime_seconds),
+            "inferenceLatency": summarize(np.concatenate(inference) if inference else np.empty(0)),
+            "outbound": self.transport.outbound_stats(),
+            "cameras": {
+                redact_url(p.camera_id): {**p.metrics.snapshot(), "counters": p.counter_stats()}
+                for p in pipelines
+            },
+        }
+
+    def debug_snapshot(self) -> dict:
+        """Live pipeline state for /debug/pipeline: stages, queues, counters and the model."""
+        return {
+            "workerId": self.settings.worker_id,
+            "running": self._running,
+            "model": {
+                "path": self.detector.model_path,
+                "loaded": self.detector.loaded,
+                "version": self.detector.version,
+                "swapMs": round(self.last_swap_ms, 1),
+            },
+            "inferenceQueueDepth": self.pool.queue_depth if self.pool is not None else 0,
+            "inferenceWorkers": self.pool.stats() if self.pool is not None else [],
+            "outbound": self.transport.outbound_stats(),
+            "cameras": [
+                {
+                    "cameraId": redact_url(p.camera_id),
+                    "running": p.running,
+                    "source": redact_url(p.settings.camera_source),
+                    "fps": round(p.fps, 2),
+                    "lastFrameMs": round(p.last_frame_ms, 2),
+                    "loopBlockedMs": round(p.loop_blocked_ms, 2),
+                    "queueSize": p.queue_size,
+                    "openTracks": p.open_tracks,
+                    "stages": p.stage_stats(),
+                    "counters": p.counter_stats(),
+                }
+                for p in list(self._pipelines.values())
+            ],
+        }
+
+    async def _health_loop(self) -> None:
+        while self._running:
+            pipelines = list(self._pipelines.values())
+            self.process_metrics.sample()
+            metrics = self.metrics_snapshot()
+            await self.transport.emit_health(
+                worker_id=self.settings.worker_id,
+                status="healthy",
+                model_loaded=self.detector.model_path,
+                cpu=metrics["cpuPercent"],
+                gpu=metrics["gpuPercent"],
+                ram=metrics["ramMb"],
+                inference_latency_ms=metrics["inferenceLatency"]["p50"],
+                active_cameras=self.active_cameras,
+                dropped_frames=sum(p.dropped_frames for p in pipelines),
+                queue_size=sum(p.queue_size for p in pipelines),
+                cameras=[
+                    {
+                        "cameraId": p.camera_id,
+                        "fps": metrics["cameras"][redact_url(p.camera_id)]["fps"],
+                        "latency": metrics["cameras"][redact_url(p.camera_id)]["latency"],
+                        "counters": metrics["cameras"][redact_url(p.camera_id)]["counters"],
+                        "motionBackend": p.motion_backend,
+                        "motionCostMs": round(p.motion_cost_ms, 2),
+                        "inferencesSkipped": p.inferences_skipped,
+                        "loopBlockedMs": round(p.loop_blocked_ms, 2),
+                        "stages": p.stage_stats(),
+                    }
+                    for p in pipelines
+                ],
+                model_version=self.detector.version,
+                model_swap_ms=self.last_swap_ms,
+                inference_queue_depth=self.pool.queue_depth if self.pool is not None else 0,
+                inference_workers=self.pool.stats() if self.pool is not None else [],
+                uptime=metrics["uptimeSeconds"],
+                inference_latency=metrics["inferenceLatency"],
+            )
+            await asyncio.sleep(self.settings.health_interval_seconds)
+
+    async def _on_camera_start(self, data: dict) -> None:
+        camera_id = data.get("cameraId")
+        if not camera_id:
+            return
+        await self.start_camera(camera_id, source_url=data.get("sourceUrl"),
+                                overrides=data.get("settings"))
+
+    async def _on_camera_stop(self, data: dict) -> None:
+        camera_id = data.get("cameraId")
+        if camera_id:
+            await self.stop_camera(camera_id)
+
+    async def _on_model_reload(self, data: dict) -> None:
+        error = None
+        try:
+            await self.reload_model(data.get("modelPath"))
+        except Exception as e:
+            logger.error("Model reload failed: %s", e)
+            error = str(e)
+        await self.transport.emit_model_reloaded(
+            success=error is None,
+            model_path=self.detector.model_path,
+            version=self.detector.version,
+            swap_ms=self.last_swap_ms,
+            error=error,
+        )
+
+    async def _on_profile(self, data: dict) -> None:
+        try:
+            await self.profile(data.get("seconds", 10), cprofile=bool(data.get("cprofile", False)))
+        except (RuntimeError, TypeError, ValueError, OSError) as e:
+            logger.error("Profile failed: %s", e)
+            await self.transport.emit_profile_report(self.settings.worker_id, success=False,
+                                                     error=str(e))
+
+    async def _on_config_update(self, data: dict):
+        """Apply a runtime config change to one camera, or to all when no cameraId is given."""
+        attr = resolve_runtime_field(data.get("section"), data.get("field"))
+        if attr is None:
+            raise ValueError(f"Unsupported config field: {data.get('section')}.{data.get('field')}")
+
+        previous = None
+        camera_id = data.get("cameraId")
+        if camera_id:
+            if camera_id not in self._pipelines:
+                raise ValueError(f"Unknown camera: {camera_id}")
+            targets = [self._pipelines[camera_id]]
+        else:
+            targets = list(self._pipelines.values())
+            previous = update_setting(self.settings, attr, data.get("value"))
+
+        for pipeline in targets:
+            previous = await pipeline.apply_config(attr, data.get("value"))
+        return previous
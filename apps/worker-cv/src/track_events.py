@@ -0,0 +1,162 @@
+"""Track-aware event candidates: one event per ByteTrack track, not per frame."""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import numpy as np
+
+from .inference import DetectionBatch
+
+START = "start"
+UPDATE = "update"
+END = "end"
+
+
+@dataclass
+class _TrackState:
+    event_id: str
+    track_id: int
+    class_name: str
+    started_at: str  # ISO timestamp of the first sighting
+    first_seen: float  # monotonic
+    last_seen: float
+    confidence: float
+    best_confidence: float
+    reported_confidence: float  # best confidence at the last start/update event
+    zones: frozenset[int] = field(default_factory=frozenset)
+    frames: int = 1
+
+
+class TrackEvents:
+    """Turns per-frame tracked detections into start / update / end event candidates.
+
+    - start: the first time a track id is seen.
+    - update: the class changed, the confidence peaked at least
+      `confidence_step` above the last reported peak, or the track entered an
+      include zone it was not in.
+    - end: the track has not been seen for `ttl_seconds` (or is evicted to
+      keep at most `max_tracks`); carries duration and best confidence.
+
+    All candidates of one track share the same id, so the backend can update
+    the event it created on start.
+    """
+
+    def __init__(self, camera_id: str, ttl_seconds: float = 2.0, max_tracks: int = 256,
+                 confidence_step: float = 0.1):
+        self.camera_id = camera_id
+        self.ttl_seconds = ttl_seconds
+        self.max_tracks = max(1, max_tracks)
+        self.confidence_step = confidence_step
+        self._tracks: OrderedDict[int, _TrackState] = OrderedDict()  # least recently seen first
+
+    def __len__(self) -> int:
+        return len(self._tracks)
+
+    def update(self, detections: DetectionBatch, zones: list[frozenset[int]] | None = None,
+               now: float | None = None) -> list[dict]:
+        """Feed one frame's notable detections; returns the event candidates to emit.
+
+        Args:
+            zones: per detection, the indices of the include zones containing it.
+        """
+        now = time.monotonic() if now is None else now
+        timestamp = datetime.now(timezone.utc).isoformat()
+        events = []
+        names = detections.class_names.tolist()
+        confidences = np.round(detections.confidence.astype(np.float64), 3).tolist()
+        for i, (track_id, class_name, confidence) in enumerate(
+                zip(detections.track_ids.tolist(), names, confidences)):
+            in_zones = zones[i] if zones is not None else frozenset()
+            state = self._tracks.get(track_id)
+            if state is None:
+                state = _TrackState(
+                    event_id=str(uuid4()), track_id=track_id, class_name=class_name,
+                    started_at=timestamp, first_seen=now, last_seen=now, confidence=confidence,
+                    best_confidence=confidence, reported_confidence=confidence, zones=in_zones,
+                )
+                self._tracks[track_id] = state
+                events.append(self._event(state, START, timestamp, "detected"))
+                continue
+
+            self._tracks.move_to_end(track_id)
+            state.last_seen = now
+            state.frames += 1
+            state.confidence = confidence
+            state.best_confidence = max(state.best_confidence, confidence)
+            entered = in_zones - state.zones
+            state.zones = in_zones
+            reasons = []
+            if class_name != state.class_name:
+                reasons.append("class_change")
+                state.class_name = class_name
+            if state.best_confidence >= state.reported_confidence + self.confidence_step:
+                reasons.append("confidence_peak")
+            if entered:
+                reasons.append("zone_entry")
+            if reasons:
+                state.reported_confidence = state.best_confidence
+                events.append(self._event(state, UPDATE, timestamp, "updated",
+                                          reasons=reasons, entered_zones=sorted(entered)))
+
+        events.extend(self.expire(now))
+        while len(self._tracks) > self.max_tracks:
+            _, state = self._tracks.popitem(last=False)
+            events.append(self._end_event(state, timestamp))
+        return events
+
+    def expire(self, now: float | None = None) -> list[dict]:
+        """Close tracks not seen for `ttl_seconds`."""
+        now = time.monotonic() if now is None else now
+        events = []
+        timestamp = None
+        while self._tracks:
+            state = next(iter(self._tracks.values()))
+            if now - state.last_seen < self.ttl_seconds:
+                break
+            del self._tracks[state.track_id]
+            timestamp = timestamp or datetime.now(timezone.utc).isoformat()
+            events.append(self._end_event(state, timestamp))
+        return events
+
+    def close_all(self) -> list[dict]:
+        """End every open track (camera stopping)."""
+        timestamp = datetime.now(timezone.utc).isoformat()
+        events = [self._end_event(state, timestamp) for state in self._tracks.values()]
+        self._tracks.clear()
+        return events
+
+    def _end_event(self, state: _TrackState, timestamp: str) -> dict:
+        event = self._event(state, END, timestamp, "left")
+        event["timestampEnd"] = timestamp
+        event["metadata"]["durationSeconds"] = round(state.last_seen - state.first_seen, 2)
+        event["metadata"]["frames"] = state.frames
+        return event
+
+    def _event(self, state: _TrackState, phase: str, timestamp: str, verb: str,
+               reasons: list[str] | None = None, entered_zones: list[int] | None = None) -> dict:
+        metadata = {
+            "className": state.class_name,
+            "confidence": state.confidence,
+            "bestConfidence": state.best_confidence,
+            "trackId": f"track_{state.track_id}",
+            "zones": sorted(state.zones),
+        }
+        if reasons:
+            metadata["reasons"] = reasons
+        if entered_zones:
+            metadata["enteredZones"] = entered_zones
+        return {
+            "id": state.event_id,
+            "cameraId": self.camera_id,
+            "timestamp": timestamp,
+            "timestampStart": state.started_at,
+            "phase": phase,
+            "type": "object_detected",
+            "severity": "low",
+            "summary": f"{state.class_name} {verb} (best conf: {state.best_confidence:.2f})",
+            "metadata": metadata,
+            "snapshotPath": None,
+        }
@@ -1,19 +1,54 @@
 """Socket.IO transport for communication with backend."""
 
+import asyncio
+import contextlib
 import logging
+from collections import deque
 from datetime import datetime, timezone
 
 import socketio
 
+from .spool import Spool
+
 logger = logging.getLogger("motionops.transport")
 
+# High-rate events coalesced into worker:batch
+BATCHED_EVENTS = ("worker:detection", "worker:track_update", "worker:event_candidate")
+# Worthless once late: dropped when the queue is full or the backend is unreachable
+DROPPABLE_EVENTS = ("worker:detection", "worker:track_update", "worker:motion", "worker:health")
+RECONNECT_SECONDS = 5
+
 
 class SocketTransport:
-    """Manages Socket.IO connection to the MotionOps backend."""
+    """Manages Socket.IO connection to the MotionOps backend.
+
+    Emits never wait on the network: events go into a bounded in-memory queue
+    drained by a background sender. Detections, track updates, motion and
+    health are dropped when the queue is full or the backend is unreachable.
+    Everything else (event candidates, camera status...) overflows to a
+    size-capped spool file, replayed in order once the backend is reachable.
 
-    def __init__(self, api_url: str, api_key: str = ""):
+    Detections, track updates and event candidates are coalesced into one
+    `worker:batch` event ({"items": [{"event", "data"}, ...]}, in emit order)
+    every `batch_interval_ms`, or as soon as `batch_max_items` are waiting. A
+    lone item is sent as its original event. Other events are sent at once.
+    """
+
+    def __init__(self, api_url: str, api_key: str = "", batch_interval_ms: float = 100,
+                 batch_max_items: int = 100,
+                 queue_size: int = 1000, spool_path: str = "spool/outbound.jsonl",
+                 spool_max_bytes: int = 50 * 1024 * 1024):
         self.api_url = api_url
         self.api_key = api_key
+        self.batch_interval_ms = batch_interval_ms  # 0 disables batching
+        self.batch_max_items = max(1, batch_max_items)
+        self.queue_size = max(1, queue_size)
+        self._outbox: deque[dict] = deque()
+        self._spool = Spool(spool_path, spool_max_bytes)
+        self._wakeup = asyncio.Event()
+        self._sender: asyncio.Task | None = None
+        self._reconnect: asyncio.Task | None = None
+        self.dropped_events = 0
         self.sio = socketio.AsyncClient(
             reconnection=True,
             reconnection_delay=1,
@@ -21,12 +56,17 @@ class SocketTransport:
         )
         self._config_handler = None
         self._preset_handler = None
+        self._camera_start_handler = None
+        self._camera_stop_handler = None
+        self._reload_handler = None
+        self._profile_handler = None
         self._setup_handlers()
 
     def _setup_handlers(self) -> None:
         @self.sio.event
         async def connect():
             logger.info("Connected to backend at %s", self.api_url)
+            self._wakeup.set()  # send what queued up (and the spool) while offline
 
         @self.sio.event
         async def disconnect():
@@ -35,17 +75,22 @@ class SocketTransport:
         @self.sio.on("config:update")
         async def on_config_update(data):
             logger.info("Config update: %s.%s = %s", data.get("section"), data.get("field"), data.get("value"))
+            previous, error = None, None
             if self._config_handler:
-                await self._config_handler(data)
+                try:
+                    previous = await self._config_handler(data)
+                except Exception as e:
+                    logger.error("Config update rejected: %s", e)
+                    error = str(e)
             # Acknowledge
             await self.sio.emit("worker:config_applied", {
-                "success": True,
+                "success": error is None,
                 "section": data.get("section"),
                 "field": data.get("field"),
                 "value": data.get("value"),
-                "previousValue": None,
+                "previousValue": previous,
                 "appliedAt": datetime.now(timezone.utc).isoformat(),
-                "error": None,
+                "error": error,
             })
 
         @self.sio.on("config:apply_preset")
@@ -57,14 +102,26 @@ class SocketTransport:
         @self.sio.on("worker:stop")
         async def on_stop(data):
             logger.info("Stop camera: %s", data.get("cameraId"))
+            if self._camera_stop_handler:
+                await self._camera_stop_handler(data)
 
         @self.sio.on("worker:start")
         async def on_start(data):
             logger.info("Start camera: %s", data.get("cameraId"))
+            if self._camera_start_handler:
+                await self._camera_start_handler(data)
 
         @self.sio.on("worker:reload_model")
         async def on_reload(data):
             logger.info("Reload model: %s", data.get("modelPath"))
+            if self._reload_handler:
+                await self._reload_handler(data)
+
+        @self.sio.on("worker:profile")
+        async def on_profile(data):
+            logger.info("Profile requested: %s s", data.get("seconds"))
+            if self._profile_handler:
+                await self._profile_handler(data)
 
     def on_config_update(self, handler):
         self._config_handler = handler
@@ -72,24 +129,136 @@ class SocketTransport:
     def on_preset_apply(self, handler):
         self._preset_handler = handler
 
+    def on_camera_start(self, handler):
+        self._camera_start_handler = handler
+
+    def on_camera_stop(self, handler):
+        self._camera_stop_handler = handler
+
+    def on_model_reload(self, handler):
+        self._reload_handler = handler
+
+    def on_profile(self, handler):
+        self._profile_handler = handler
+
     async def connect(self) -> None:
         if not self.api_url.startswith('https://') and not self.api_url.startswith('http://localhost'):
             logger.warning("SECURITY: Connecting to backend without TLS! URL: %s", self.api_url)
+        if not await self._try_connect():
+            # python-socketio only reconnects after a first successful connection
+            self._reconnect = asyncio.create_task(self._reconnect_loop())
+        if self._sender is None:
+            self._sender = asyncio.create_task(self._send_loop())
+
+    async def disconnect(self) -> None:
+        for task in (self._reconnect, self._sender):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._reconnect = self._sender = None
+        if self.sio.connected:
+            await self._drain()
+        # Undelivered events that matter survive in the spool for the next run. They were
+        # queued before anything already spooled, so they go ahead of it
+        self._spool.prepend([item for item in self._outbox
+                             if item["event"] not in DROPPABLE_EVENTS])
+        self._outbox.clear()
+        self._spool.close()
+        if self.sio.connected:
+            await self.sio.disconnect()
+
+    def outbound_stats(self) -> dict:
+        """Outbound queue and spool counters, for worker:health."""
+        return {
+            "queued": len(self._outbox),
+            "dropped": self.dropped_events,
+            "spooled": self._spool.spooled,
+            "spoolDropped": self._spool.dropped,
+            "spoolBytes": self._spool.size_bytes,
+        }
+
+    async def _try_connect(self) -> bool:
         try:
             await self.sio.connect(self.api_url, namespaces=["/"], auth={"workerKey": self.api_key})
             logger.info("Socket.IO connected to %s", self.api_url)
+            return True
         except Exception as e:
             logger.error("Connection failed: %s", e)
+            return False
 
-    async def disconnect(self) -> None:
-        if self.sio.connected:
-            await self.sio.disconnect()
+    async def _reconnect_loop(self) -> None:
+        while not await self._try_connect():
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+    async def _send_loop(self) -> None:
+        """Background sender: wakes on urgent events, or every batch interval."""
+        interval = self.batch_interval_ms / 1000 if self.batch_interval_ms > 0 else None
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+            self._wakeup.clear()
+            if self.sio.connected:
+                await self._drain()
+
+    async def _drain(self) -> None:
+        """Send the in-memory queue, then the spool, in order; stops at the first failure."""
+        while self._outbox:
+            items = self._take_chunk()
+            if not await self._send(items):
+                self._outbox.extendleft(reversed(items))
+                return
+        while self._spool.pending:
+            records, position = self._spool.read(self.batch_max_items)
+            if records and not await self._send(records):
+                return
+            self._spool.commit(position)
+
+    def _take_chunk(self) -> list[dict]:
+        """The next event, plus the batchable events right behind it (up to batch_max_items)."""
+        chunk = [self._outbox.popleft()]
+        if self.batch_interval_ms > 0 and chunk[0]["event"] in BATCHED_EVENTS:
+            while (self._outbox and len(chunk) < self.batch_max_items
+                   and self._outbox[0]["event"] in BATCHED_EVENTS):
+                chunk.append(self._outbox.popleft())
+        return chunk
+
+    async def _send(self, items: list[dict]) -> bool:
+        """Emit one event, or several as worker:batch. Returns False if the send failed."""
+        try:
+            if len(items) == 1:
+                await self.sio.emit(items[0]["event"], items[0]["data"])
+            else:
+                await self.sio.emit("worker:batch", {"items": items})
+            return True
+        except Exception as e:
+            logger.warning("Send failed, keeping %d events queued: %s", len(items), e)
+            return False
+
+    async def _emit(self, event: str, data: dict) -> None:
+        """Queue an event for the background sender; never waits on the network."""
+        if event in DROPPABLE_EVENTS:
+            if not self.sio.connected or len(self._outbox) >= self.queue_size:
+                self.dropped_events += 1
+                return
+        elif self._spool.pending or len(self._outbox) >= self.queue_size:
+            # Once spooling, later events go behind the spooled ones to keep their order
+            self._spool.append(event, data)
+            return
+        self._outbox.append({"event": event, "data": data})
+        if (self.batch_interval_ms <= 0 or event not in BATCHED_EVENTS
+                or len(self._outbox) >= self.batch_max_items):
+            self._wakeup.set()
 
     async def emit_health(self, worker_id: str, status: str, model_loaded: str,
                           cpu: float = 0, gpu: float = 0, ram: int = 0,
                           inference_latency_ms: float = 0, active_cameras: int = 0,
-                          dropped_frames: int = 0, queue_size: int = 0) -> None:
-        await self.sio.emit("worker:health", {
+                          dropped_frames: int = 0, queue_size: int = 0,
+                          cameras: list | None = None, model_version: int = 0,
+                          model_swap_ms: float = 0, inference_queue_depth: int = 0,
+                          inference_workers: list | None = None, uptime: int = 0,
+                          inference_latency: dict | None = None) -> None:
+        await self._emit("worker:health", {
             "workerId": worker_id,
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "status": status,
@@ -98,16 +267,51 @@ class SocketTransport:
             "ram": ram,
             "activeCameras": active_cameras,
             "inferenceLatencyMs": round(inference_latency_ms, 1),
+            "inferenceLatency": inference_latency or {},
             "droppedFrames": dropped_frames,
             "queueSize": queue_size,
             "modelLoaded": model_loaded,
-            "uptime": 0,
+            "modelVersion": model_version,
+            "modelSwapMs": round(model_swap_ms, 1),
+            "uptime": uptime,
+            "cameras": cameras or [],
+            "inferenceQueueDepth": inference_queue_depth,
+            "inferenceWorkers": inference_workers or [],
+            "outbound": self.outbound_stats(),
+        })
+
+    async def emit_startup(self, worker_id: str, report: dict) -> None:
+        await self._emit("worker:startup", {
+            "workerId": worker_id,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            **report,
+        })
+
+    async def emit_profile_report(self, worker_id: str, success: bool, report: dict | None = None,
+                                  error: str | None = None) -> None:
+        await self._emit("worker:profile_report", {
+            "workerId": worker_id,
+            "success": success,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "error": error,
+            **(report or {}),
+        })
+
+    async def emit_model_reloaded(self, success: bool, model_path: str, version: int,
+                                  swap_ms: float, error: str | None = None) -> None:
+        await self._emit("worker:model_reloaded", {
+            "success": success,
+            "modelPath": model_path,
+            "modelVersion": version,
+            "swapMs": round(swap_ms, 1),
+            "reloadedAt": datetime.now(timezone.utc).isoformat(),
+            "error": error,
         })
 
     async def emit_camera_status(self, camera_id: str, status: str, fps: float,
                                   resolution: str | None, latency_ms: float,
                                   error_message: str | None = None) -> None:
-        await self.sio.emit("worker:camera_status", {
+        await self._emit("worker:camera_status", {
             "cameraId": camera_id,
             "status": status,
             "fps": round(fps, 1),
@@ -117,20 +321,29 @@ class SocketTransport:
             "errorMessage": error_message,
         })
 
-    async def emit_detection(self, camera_id: str, frame_number: int, detections: list) -> None:
-        await self.sio.emit("worker:detection", {
+    async def emit_detection(self, camera_id: str, frame_number: int,
+                             detections: list | dict) -> None:
+        await self._emit("worker:detection", {
             "cameraId": camera_id,
             "frameNumber": frame_number,
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "detections": detections,
         })
 
+    async def emit_motion(self, camera_id: str, frame_number: int, motion: dict) -> None:
+        await self._emit("worker:motion", {
+            "cameraId": camera_id,
+            "frameNumber": frame_number,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            **motion,
+        })
+
     async def emit_track_update(self, camera_id: str, tracks: list) -> None:
-        await self.sio.emit("worker:track_update", {
+        await self._emit("worker:track_update", {
             "cameraId": camera_id,
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "tracks": tracks,
         })
 
     async def emit_event_candidate(self, event: dict) -> None:
-        await self.sio.emit("worker:event_candidate", event)
+        await self._emit("worker:event_candidate", event)